@@ -1,5 +1,13 @@
 import argparse
-from src.processors.video_processor import VideoProcessor
+from src.core.replay import run_replay
+from src.core.simulation import run_simulation
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 def main():
     parser = argparse.ArgumentParser(description="Run the video processor with optional configurations.")
@@ -8,14 +16,42 @@ def main():
     parser.add_argument("--camera", type=int, default=0, help="Camera ID")
     parser.add_argument("--detection_confidence", type=float, default=0.5, help="Face detection confidence")
     parser.add_argument("--config", type=str, default="config.json", help="Path to configuration file")
+    parser.add_argument("--source", type=str, default=None, help="Play from a video file or .npy/.npz frame stack instead of the camera")
+    parser.add_argument("--loop", action="store_true", help="Restart the --source from the beginning when it ends")
+    parser.add_argument("--benchmark", action="store_true", help="Process frames as fast as possible without a window and report per-stage throughput")
+    parser.add_argument("--max-frames", type=int, default=None, help="Stop after this many frames")
+    parser.add_argument("--record", type=str, default=None, help="Record each game's seed and per-tick input to <path stem>_<n>.npz")
+    parser.add_argument("--replay", type=str, default=None, help="Re-run a recorded trace through the game engine and exit")
+    parser.add_argument("--profile", action="store_true", help="With --replay: print a cProfile report of the engine")
+    parser.add_argument("--repeat", type=int, default=1, help="With --replay: number of times to run the trace")
+    parser.add_argument("--simulate", type=positive_int, default=None, metavar="N", help="Play N headless games with a bot, print survival and score distributions and exit")
+    parser.add_argument("--seed", type=int, default=None, help="With --simulate: seed for the sequence of games")
+    parser.add_argument("--max-game-seconds", type=float, default=300.0, help="With --simulate: stop games that last longer than this")
 
     args = parser.parse_args()
 
+    if args.replay:
+        run_replay(args.replay, config_path=args.config, profile=args.profile, repeat=args.repeat)
+        return
+
+    if args.simulate is not None:
+        run_simulation(args.simulate, config_path=args.config, seed=args.seed, max_seconds=args.max_game_seconds)
+        return
+
+    # Imported here so replays and simulations run without the camera and inference stack
+    from src.processors.video_processor import VideoProcessor
+
     processor = VideoProcessor(
         host=args.host,
         port=args.port,
         camera_id=args.camera,
-        detection_confidence=args.detection_confidence
+        detection_confidence=args.detection_confidence,
+        config_path=args.config,
+        source=args.source,
+        loop_source=args.loop,
+        benchmark=args.benchmark,
+        max_frames=args.max_frames,
+        record_path=args.record
     )
     processor.run()
 
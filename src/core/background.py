@@ -0,0 +1,146 @@
+import random
+
+import pygame
+
+
+class ScrollingLayer:
+    """A horizontal band pre-rendered once into a wrap-around tile.
+
+    The tile is exactly as wide as the screen and its content wraps at the
+    edges, so scrolling only needs two blits per frame no matter how much is
+    drawn on it.
+    """
+
+    def __init__(self, name, tile, y, speed):
+        self.name = name
+        self.tile = tile
+        self.y = y
+        self.speed = speed  # Pixels per frame, scaled by dt * 60 like the rest of the game
+        self.offset = 0.0
+        self._scaled_tiles = {}  # scale -> tile resized for a lower internal resolution
+
+    @property
+    def rect(self):
+        return pygame.Rect(0, self.y, self.tile.get_width(), self.tile.get_height())
+
+    def update(self, dt=1 / 60):
+        self.offset = (self.offset + self.speed * dt * 60) % self.tile.get_width()
+
+    def _tile_for(self, scale):
+        if scale == 1.0:
+            return self.tile
+        tile = self._scaled_tiles.get(scale)
+        if tile is None:
+            size = (round(self.tile.get_width() * scale), max(1, round(self.tile.get_height() * scale)))
+            tile = pygame.transform.scale(self.tile, size)
+            self._scaled_tiles[scale] = tile
+        return tile
+
+    def draw(self, screen, scale=1.0):
+        """Blit the layer; with scale < 1 onto a game layer rendered at that fraction of the size."""
+        tile = self._tile_for(scale)
+        x = -int(self.offset * scale)
+        y = round(self.y * scale)
+        screen.blit(tile, (x, y))
+        screen.blit(tile, (x + tile.get_width(), y))
+
+
+class Background:
+    """Scrolling ground plus optional parallax layers, all baked into tiles at startup.
+
+    Layers come from the `background.layers` config list, drawn in order (far
+    to near); each entry has a `type` ("hills" or "clouds"), `y`, `height`,
+    `speed`, `color` and an optional `seed`.
+    """
+
+    # Transparent pixels of the tiles; colorkey blits are much cheaper than per-pixel alpha
+    COLOR_KEY = (255, 0, 255)
+
+    def __init__(self, config, width, height, ground_y, ground_color, ground_speed, target=None):
+        self.width = width
+        self.height = height
+        self.target = target  # Surface the tiles are blitted to; tiles share its pixel format
+        self.layers = []
+
+        for index, layer_config in enumerate(config.get('background', {}).get('layers', [])):
+            layer = self._create_layer(index, layer_config)
+            if layer:
+                self.layers.append(layer)
+
+        self.layers.append(ScrollingLayer('ground', self._bake_ground(ground_color), ground_y - 1, ground_speed))
+
+    def _create_layer(self, index, layer_config):
+        layer_type = layer_config.get('type', 'hills')
+        band_height = layer_config.get('height', 150)
+        y = layer_config.get('y', self.height - 100 - band_height)
+        color = tuple(layer_config.get('color', (70, 70, 90)))
+        rng = random.Random(layer_config.get('seed', index))
+
+        tile = self._new_tile(band_height)
+        if layer_type == 'hills':
+            self._bake_hills(tile, color, rng, layer_config.get('count', 6))
+        elif layer_type == 'clouds':
+            self._bake_clouds(tile, color, rng, layer_config.get('count', 5))
+        else:
+            print(f"Warning: Unknown background layer type '{layer_type}', skipping.")
+            return None
+
+        return ScrollingLayer(layer_config.get('name', f'{layer_type}_{index}'), tile, y, layer_config.get('speed', 1.0))
+
+    def _new_tile(self, tile_height):
+        if self.target is not None:
+            tile = pygame.Surface((self.width, tile_height), 0, self.target)
+        else:
+            tile = pygame.Surface((self.width, tile_height))
+        tile.fill(self.COLOR_KEY)
+        tile.set_colorkey(self.COLOR_KEY, pygame.RLEACCEL)
+        return tile
+
+    def _draw_wrapped(self, draw_fn, x, *args):
+        """Draw a shape at x and at its wrap-around copies so the tile edges match."""
+        for shift in (-self.width, 0, self.width):
+            draw_fn(x + shift, *args)
+
+    def _bake_ground(self, color):
+        # Same ground line and dash pattern the renderer used to draw line by line each frame
+        tile = self._new_tile(3)
+        pygame.draw.line(tile, color, (0, 1), (self.width, 1), 3)
+        for i in range(0, self.width + 20, 20):
+            self._draw_wrapped(lambda x: pygame.draw.line(tile, color, (x, 1), (x + 10, 1), 3), i % self.width)
+        return tile
+
+    def _bake_hills(self, tile, color, rng, count):
+        band_w, band_h = tile.get_size()
+        for _ in range(count):
+            center = rng.uniform(0, band_w)
+            half_width = rng.uniform(band_w * 0.08, band_w * 0.2)
+            peak = rng.uniform(band_h * 0.1, band_h * 0.6)
+            self._draw_wrapped(
+                lambda x: pygame.draw.polygon(tile, color, [(x - half_width, band_h), (x, peak), (x + half_width, band_h)]),
+                center
+            )
+
+    def _bake_clouds(self, tile, color, rng, count):
+        band_w, band_h = tile.get_size()
+        for _ in range(count):
+            center = rng.uniform(0, band_w)
+            cloud_w = rng.uniform(60, 140)
+            cloud_h = rng.uniform(band_h * 0.2, band_h * 0.5)
+            top = rng.uniform(0, band_h - cloud_h)
+            self._draw_wrapped(
+                lambda x: pygame.draw.ellipse(tile, color, pygame.Rect(int(x - cloud_w / 2), int(top), int(cloud_w), int(cloud_h))),
+                center
+            )
+
+    @property
+    def rects(self):
+        """Screen bands covered by the layers; they change every frame while scrolling."""
+        return [layer.rect for layer in self.layers]
+
+    def update(self, dt=1 / 60):
+        for layer in self.layers:
+            layer.update(dt)
+
+    def draw(self, screen, scale=1.0):
+        for layer in self.layers:
+            layer.draw(screen, scale)
@@ -0,0 +1,109 @@
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+import pygame
+
+WINDOW_TITLE = 'Head Jump Game'
+
+
+class DisplayBackend(ABC):
+    """The single window the game is presented in, plus the event loop feeding input.
+
+    Renderer draws onto `surface`; present() shows it and poll_keys() returns
+    the keys pressed since the last call as codes InputHandler understands
+    (ASCII, 27 for ESC).
+    """
+
+    name = 'base'
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.surface = None
+
+    @abstractmethod
+    def present(self, rects=None):
+        """Show the surface; rects, if given, are the only regions that changed."""
+
+    def poll_keys(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class PygameDisplayBackend(DisplayBackend):
+    """Draws straight into the pygame display surface and reads pygame events."""
+
+    name = 'pygame'
+
+    def __init__(self, width, height):
+        super().__init__(width, height)
+        pygame.display.init()
+        self.surface = pygame.display.set_mode((width, height))
+        pygame.display.set_caption(WINDOW_TITLE)
+
+    def present(self, rects=None):
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def poll_keys(self):
+        keys = []
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                keys.append(ord('q'))
+            elif event.type == pygame.KEYDOWN and event.key < 256:
+                keys.append(event.key) # pygame key codes match ASCII for letters, space and ESC
+        return keys
+
+    def close(self):
+        pygame.display.quit()
+
+
+class BufferDisplayBackend(DisplayBackend):
+    """Composes into a preallocated BGR NumPy buffer; nothing is shown.
+
+    Used for headless runs (benchmarks) and as the base of the OpenCV backend.
+    """
+
+    name = 'headless'
+
+    def __init__(self, width, height):
+        super().__init__(width, height)
+        self.frame_buffer = np.zeros((height, width, 3), dtype=np.uint8)
+        self.surface = pygame.image.frombuffer(self.frame_buffer, (width, height), 'BGR')
+
+    def present(self, rects=None):
+        pass
+
+
+class OpenCVDisplayBackend(BufferDisplayBackend):
+    """Shows the BGR buffer with cv2.imshow and reads keys with cv2.waitKey."""
+
+    name = 'opencv'
+
+    def present(self, rects=None):
+        cv2.imshow(WINDOW_TITLE, self.frame_buffer)
+
+    def poll_keys(self):
+        key = cv2.waitKey(1)
+        return [] if key == -1 else [key]
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+def create_display_backend(name, width, height):
+    """Build the display backend named by video.display_backend."""
+    if name == 'pygame':
+        return PygameDisplayBackend(width, height)
+    if name == 'opencv':
+        return OpenCVDisplayBackend(width, height)
+    if name == 'headless':
+        return BufferDisplayBackend(width, height)
+
+    print(f"Warning: Unknown display backend '{name}', using pygame.")
+    return PygameDisplayBackend(width, height)
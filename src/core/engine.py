@@ -1,21 +1,43 @@
 import pygame
 import numpy as np
+import hashlib
 import random
+import struct
 from datetime import datetime
 from src.utils.game_utils import GameState
 from src.entities.player import Player
+from src.entities.entity_store import EntityStore
 
 class GameEngine:
-    def __init__(self, config, asset_manager):
+    def __init__(self, config, asset_manager=None, seed=None, verbose=True):
+        """Game rules and state.
+
+        Without an asset_manager the engine runs headless: nothing it does needs
+        a display or loaded assets, so games can be simulated in bulk.
+        verbose=False silences the per-event debug prints (warnings remain).
+        """
         self.config = config
         self.asset_manager = asset_manager
+        self.verbose = verbose
         self._game_state = GameState.MENU
         self.score = 0
+        self._score_remainder = 0.0 # Fraction of a point not yet added to score
         self.distance_traveled = 0
         self.start_time = None
 
+        # All gameplay randomness comes from a private RNG. Each game is seeded from
+        # seed_source, so (seed, per-tick dt and nose points) fully determine a game.
+        self.seed_source = random.Random(seed)
+        self.seed = self.seed_source.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        # Simulation clock: sum of dt passed to update(), used for timers instead of wall-clock time
+        self.sim_time = 0.0
+        self.tick_count = 0
+
         # -- Merged from ObstacleManager --
-        self.obstacles = []
+        self.obstacle_types = config.get('obstacles', {})
+        # Obstacles and power-ups live in struct-of-arrays stores (one column per attribute)
+        self.obstacles = EntityStore(t for t in self.obstacle_types if 'gap' not in t and t != 'base')
         self.obstacle_spawn_timer = 0
         game_config = config.get('game', {})
         video_config = config.get('video', {})
@@ -27,6 +49,11 @@ class GameEngine:
         self.current_max_spawn_interval = self.base_max_spawn_interval
         self._next_spawn_frame = self._calculate_next_spawn_frame()
         self.pattern_queue = []
+        # 'batched' (vectorized broadphase), 'legacy' (one pygame.Rect per entity) or
+        # 'verify' (run both and warn when they disagree)
+        self.collision_mode = game_config.get('collision_mode', 'batched')
+        # Test the motion over each whole tick instead of only where it ended (batched path only)
+        self.continuous_collision = game_config.get('continuous_collision', False)
         # Load pattern_spawn_chance from difficulty section for consistency
         self.pattern_spawn_chance = config.get('difficulty', {}).get('pattern_spawn_chance', 0.3)
         # Load available_patterns from the top-level config, not game_config
@@ -35,14 +62,13 @@ class GameEngine:
             "double_low": ["low_cactus", "short_gap", "low_cactus"],
             "high_low": ["flying_rock", "wide_gap", "low_cactus"]
         })
-        self.obstacle_types = config.get('obstacles', {})
         self.screen_width = video_config.get('width', 1280)
         self.screen_height = video_config.get('height', 720) # Added for consistency
         self.ground_level = self.screen_height - config.get('player', {}).get('ground_offset', 100)
         # -- End ObstacleManager Init --
 
         # -- Merged from PowerUpManager --
-        self.power_ups = []
+        self.power_ups = EntityStore(config.get('powerup', {}).get('types', {}).keys())
         self.power_up_active = False # Tracks if *any* powerup is active
         self.active_power_up_type = None # Stores the type of the current active powerup
         self.power_up_timer = None
@@ -56,7 +82,7 @@ class GameEngine:
         self.all_sprites = pygame.sprite.Group()
 
         # Create player
-        self.player = Player(config, self.asset_manager)
+        self.player = Player(config, self.asset_manager, verbose=verbose)
         self.all_sprites.add(self.player)
 
     def update(self, dt, nose_point=None):
@@ -66,12 +92,17 @@ class GameEngine:
         if self.start_time is None:
             self.start_time = datetime.now()
 
+        self.sim_time += dt
+        self.tick_count += 1
+
         # Update player
         self.player.update(dt, nose_point)
+        self.player.animate(self.sim_time)
 
         # --- Integrated Obstacle Update ---
         self._update_difficulty(self.score)
-        self.obstacle_spawn_timer += 1
+        # Spawn intervals are in frames at 60 FPS; count simulated time so they don't depend on the tick rate
+        self.obstacle_spawn_timer += dt * 60
         if self.obstacle_spawn_timer >= self._next_spawn_frame:
             self.obstacle_spawn_timer = 0
             self._spawn_obstacle_or_pattern()
@@ -93,7 +124,7 @@ class GameEngine:
 
     # --- Merged ObstacleManager Methods ---
     def _calculate_next_spawn_frame(self):
-        return random.randint(self.current_min_spawn_interval, self.current_max_spawn_interval)
+        return self.rng.randint(self.current_min_spawn_interval, self.current_max_spawn_interval)
 
     def _update_difficulty(self, game_score):
         difficulty_config = self.config.get('difficulty', {})
@@ -115,12 +146,12 @@ class GameEngine:
 
     def _spawn_obstacle_or_pattern(self):
         if not self.pattern_queue:
-            if random.random() < self.pattern_spawn_chance and self.available_patterns:
+            if self.rng.random() < self.pattern_spawn_chance and self.available_patterns:
                 self._generate_pattern()
             else:
                 valid_types = [t for t in self.obstacle_types.keys() if 'gap' not in t and t != 'base']
                 if valid_types:
-                    self._create_obstacle(random.choice(valid_types))
+                    self._create_obstacle(self.rng.choice(valid_types))
 
         if self.pattern_queue:
             next_item = self.pattern_queue.pop(0)
@@ -135,7 +166,7 @@ class GameEngine:
     def _generate_pattern(self):
         if not self.available_patterns:
             return
-        pattern_name = random.choice(list(self.available_patterns.keys()))
+        pattern_name = self.rng.choice(list(self.available_patterns.keys()))
         self.pattern_queue = list(self.available_patterns[pattern_name])
         # print(f"Generated pattern: {pattern_name} -> {self.pattern_queue}") # Optional debug
 
@@ -149,8 +180,7 @@ class GameEngine:
         width = type_config.get('width', base_config.get('width', 50))
         height_min = type_config.get('height_min', base_config.get('height_min', 50))
         height_max = type_config.get('height_max', base_config.get('height_max', 100))
-        height = random.randint(height_min, height_max)
-        color = tuple(type_config.get('color', base_config.get('color', (255, 0, 0)))) # Ensure color is tuple
+        height = self.rng.randint(height_min, height_max)
         y_pos_type = type_config.get('y_pos', base_config.get('y_pos', 'ground'))
         speed = self.current_obstacle_speed # Use current dynamic speed
 
@@ -161,42 +191,32 @@ class GameEngine:
             min_air_y = self.ground_level * 0.3 # Example: 30% from top of ground level
             max_air_y = self.ground_level * 0.7 - height # Example: Max 70% from top, accounting for height
             if max_air_y < min_air_y: max_air_y = min_air_y # Prevent invalid range
-            y = random.uniform(min_air_y, max_air_y) # Use uniform for float pos if needed
+            y = self.rng.uniform(min_air_y, max_air_y) # Use uniform for float pos if needed
         else: # Default to ground if unknown type
             y = self.ground_level - height
 
-        self.obstacles.append({
-            'x': float(self.screen_width), # Start off-screen right
-            'y': float(y),
-            'width': width,
-            'height': height,
-            'speed': speed,
-            'color': color,
-            'type': obstacle_type
-        })
+        self.obstacles.add(
+            obstacle_type,
+            float(self.screen_width), # Start off-screen right
+            float(y),
+            width,
+            height,
+            speed,
+            EntityStore.FLAG_AIR if y_pos_type == 'air' else 0
+        )
 
     def _update_obstacle_positions(self, dt):
-        active_obstacles = []
         # Use speed * dt * 60 for frame-rate independent movement
         # Apply slow motion factor to the current dynamic speed
         effective_speed = self.current_obstacle_speed * self.slow_motion_factor
         move_amount = effective_speed * dt * 60
 
-        # Update powerup speeds if slow motion is active (optional, based on design)
-        # Could also adjust powerup speed directly when slow motion activates/deactivates
-        powerup_speed_factor = self.config.get('powerup', {}).get('speed_factor', 0.8)
-        effective_powerup_speed = effective_speed * powerup_speed_factor
-
-        for obstacle in self.obstacles:
-            obstacle['x'] -= move_amount
-            # Update obstacle speed attribute if needed by other logic (e.g., scoring)
-            obstacle['speed'] = effective_speed
-            if obstacle['x'] + obstacle['width'] > 0: # Keep if still visible
-                active_obstacles.append(obstacle)
-        self.obstacles = active_obstacles
+        # One pass over the x column, then drop everything that left the screen
+        self.obstacles.move(move_amount, effective_speed)
+        self.obstacles.cull()
 
     def get_obstacles(self): # Keep for renderer access
-        return self.obstacles
+        return self.obstacles.view()
     # --- End ObstacleManager Methods ---
 
     # --- Merged PowerUpManager Methods ---
@@ -209,87 +229,79 @@ class GameEngine:
         if not available_types or self.power_up_active:
             return
 
-        if random.random() < spawn_chance:
-            chosen_type = random.choice(available_types)
-            type_config = powerup_config['types'][chosen_type]
-            color = tuple(type_config.get('color', (255, 255, 0))) # Default to yellow
-            
+        if self.rng.random() < spawn_chance:
+            chosen_type = self.rng.choice(available_types)
             # Use current dynamic obstacle speed, modified by powerup speed factor
             base_speed = self.current_obstacle_speed
             speed_factor = powerup_config.get('speed_factor', 0.8)
             powerup_speed = base_speed * speed_factor
 
             # TODO: Improve y-position randomization?
-            y_pos = self.ground_level - random.randint(30, 80)
-
-            self.power_ups.append({
-                'x': float(self.screen_width), # Start off-screen right
-                'y': float(y_pos),
-                'type': chosen_type,
-                'width': 20, # Consider making configurable
-                'height': 20,
-                'speed': powerup_speed,
-                'color': color
-            })
-            print(f"Spawned powerup: {chosen_type}") # Debug
+            y_pos = self.ground_level - self.rng.randint(30, 80)
+
+            self.power_ups.add(
+                chosen_type,
+                float(self.screen_width), # Start off-screen right
+                float(y_pos),
+                20, # Width; consider making configurable
+                20, # Height
+                powerup_speed
+            )
+            if self.verbose:
+                print(f"Spawned powerup: {chosen_type}") # Debug
 
     def _update_powerup_positions(self, dt):
         # Use dt for frame-rate independence if speeds are high or dt varies
-        active_powerups = []
         # Apply slow motion factor to powerup speed as well
         effective_speed = self.current_obstacle_speed * self.slow_motion_factor
         powerup_speed_factor = self.config.get('powerup', {}).get('speed_factor', 0.8)
         effective_powerup_speed = effective_speed * powerup_speed_factor
         move_amount = effective_powerup_speed * dt * 60
 
-        for power_up in self.power_ups:
-            # Update the speed stored in the powerup dict itself if necessary
-            power_up['speed'] = effective_powerup_speed 
-            power_up['x'] -= move_amount # Use dt-adjusted move amount
-            if power_up['x'] + power_up['width'] > 0:
-                active_powerups.append(power_up)
-        self.power_ups = active_powerups
+        self.power_ups.move(move_amount, effective_powerup_speed)
+        self.power_ups.cull()
 
     def _check_powerup_duration(self):
-        if self.power_up_active and self.power_up_timer:
-            if (datetime.now() - self.power_up_timer).total_seconds() > self.power_up_duration:
+        if self.power_up_active and self.power_up_timer is not None:
+            if self.sim_time - self.power_up_timer > self.power_up_duration:
                 self._deactivate_powerup()
 
-    def _handle_powerup_collision(self, power_up):
+    def _handle_powerup_collision(self, index):
+        """Activate the power-up in row `index` of the power-up store and remove it."""
         # Prevent activating a new powerup if one is already active
         if self.power_up_active:
             return
         
         powerup_config = self.config.get('powerup', {})
-        powerup_type = power_up.get('type')
+        powerup_type = self.power_ups.type_name(index)
         type_config = powerup_config.get('types', {}).get(powerup_type, {})
         
-        print(f"Collided with powerup: {powerup_type}") # Debug
+        if self.verbose:
+            print(f"Collided with powerup: {powerup_type}") # Debug
         
         self.power_up_active = True
         self.active_power_up_type = powerup_type
-        self.power_up_timer = datetime.now()
+        self.power_up_timer = self.sim_time
         self.power_up_duration = type_config.get('duration', powerup_config.get('default_duration', 5))
 
         if powerup_type == 'score_boost':
             self.score_multiplier = type_config.get('multiplier', 2.0)
-            print(f"Score Boost activated! Multiplier: {self.score_multiplier}, Duration: {self.power_up_duration}s")
+            if self.verbose:
+                print(f"Score Boost activated! Multiplier: {self.score_multiplier}, Duration: {self.power_up_duration}s")
         elif powerup_type == 'invincibility':
             self.is_invincible = True
-            print(f"Invincibility activated! Duration: {self.power_up_duration}s")
+            if self.verbose:
+                print(f"Invincibility activated! Duration: {self.power_up_duration}s")
         elif powerup_type == 'slow_motion':
             self.slow_motion_factor = type_config.get('speed_multiplier', 0.5)
-            print(f"Slow Motion activated! Factor: {self.slow_motion_factor}, Duration: {self.power_up_duration}s")
+            if self.verbose:
+                print(f"Slow Motion activated! Factor: {self.slow_motion_factor}, Duration: {self.power_up_duration}s")
         
         # Remove the collected powerup
-        try:
-             self.power_ups.remove(power_up)
-        except ValueError: # Handle case where powerup might already be removed (e.g., race condition)
-             print(f"Warning: Could not remove powerup {power_up}, already removed?")
-             pass 
+        self.power_ups.remove(index)
 
     def get_powerups(self): # Keep for renderer access
-        return self.power_ups
+        return self.power_ups.view()
 
     def get_score_multiplier(self): # Keep for renderer/UI access
         return self.score_multiplier
@@ -298,7 +310,8 @@ class GameEngine:
         return self.power_up_active
 
     def _deactivate_powerup(self):
-        print(f"Deactivating powerup: {self.active_power_up_type}") # Debug
+        if self.verbose:
+            print(f"Deactivating powerup: {self.active_power_up_type}") # Debug
         self.power_up_active = False
         self.active_power_up_type = None
         self.score_multiplier = 1.0
@@ -314,15 +327,30 @@ class GameEngine:
             'state': self._game_state,
             'all_sprites': self.all_sprites,
             'player': self.player.get_state() if self._game_state == GameState.PLAYING else None,
-            'obstacles': self.obstacles, # Direct access
-            'power_ups': self.power_ups, # Direct access
+            'obstacles': self.obstacles.view(), # Read-only column view
+            'power_ups': self.power_ups.view(), # Read-only column view
             'score': self.score,
             'distance_traveled': self.distance_traveled,
             'score_multiplier': self.score_multiplier, # Direct access
             'is_invincible': self.is_invincible,
-            'slow_motion_factor': self.slow_motion_factor
+            'slow_motion_factor': self.slow_motion_factor,
+            'sim_time': self.sim_time # Drives animation frames
         }
 
+    def state_digest(self):
+        """Hash of the simulation state: clock, score, player and every obstacle and power-up.
+
+        Two runs that agree on this went through the same game, not just to the same score.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(struct.pack('<qdd', self.tick_count, self.sim_time, float(self.score)))
+        digest.update(struct.pack('<dd', self.player.rect.y, self.player.jump_velocity))
+        for store in (self.obstacles, self.power_ups):
+            n = len(store)
+            for column in ('x', 'y', 'width', 'height', 'type_id'):
+                digest.update(np.ascontiguousarray(getattr(store, column)[:n]).tobytes())
+        return digest.hexdigest()
+
     @property
     def game_state(self):
         return self._game_state
@@ -340,43 +368,91 @@ class GameEngine:
 
     def _check_collisions(self):
         player_rect = self.player.get_rect()
-        player_is_jumping = self.player.is_jumping
+
+        if self.collision_mode == 'legacy':
+            obstacle_index, powerup_index = self._find_collisions_legacy(player_rect)
+        else:
+            obstacle_index, powerup_index = self._find_collisions(player_rect, self.continuous_collision)
+            if self.collision_mode == 'verify':
+                # Swept hits legitimately include more than the per-rect test, so compare end-of-tick hits
+                batched = (self._find_collisions(player_rect) if self.continuous_collision
+                           else (obstacle_index, powerup_index))
+                expected = self._find_collisions_legacy(player_rect)
+                if batched != expected:
+                    print(f"Warning: Batched collision hits {batched} "
+                          f"differ from per-rect hits {expected} at tick {self.tick_count}")
+
+        if obstacle_index is not None:
+            obstacle = self.obstacles.row(obstacle_index)
+            if self.verbose:
+                print(f"Collision detected with {obstacle['type']} obstacle at ({obstacle['x']:.0f}, {obstacle['y']:.0f})")
+            self.game_state = GameState.GAME_OVER
+            self.player.animate(self.sim_time, 'idle')
+            return # Exit early on game over
+
+        if powerup_index is not None:
+            self._handle_powerup_collision(powerup_index)
+
+    def _find_collisions(self, player_rect, swept=False):
+        """Return (obstacle index, power-up index) of the first hits, or None for each.
+
+        Batched path: each store answers with one broadphase query instead of
+        a Rect per entity. With `swept`, entities and the player's vertical
+        motion are tested over the whole tick, so nothing can pass through
+        the player between two ticks however far it moved.
+        """
+        # Air obstacles can only be hit while the player is jumping (at any point of a swept tick)
+        is_jumping = self.player.is_jumping or (swept and self.player.was_jumping)
 
         # Check obstacle collisions only if not invincible
         if not self.is_invincible:
-            for obstacle in self.obstacles:
-                obstacle_type = obstacle.get('type')
-                obstacle_config = self.obstacle_types.get(obstacle_type, {})
-                y_pos_type = obstacle_config.get('y_pos', 'ground')
-                is_air_obstacle = y_pos_type == 'air'
+            skip_flags = 0 if is_jumping else EntityStore.FLAG_AIR
+            hits = self._overlapping(self.obstacles, player_rect, swept, skip_flags)
+            if len(hits):
+                return int(hits[0]), None
+
+        # Check powerup collisions (always check, regardless of invincibility)
+        hits = self._overlapping(self.power_ups, player_rect, swept)
+        return None, (int(hits[0]) if len(hits) else None)
+
+    def _overlapping(self, store, player_rect, swept, skip_flags=0):
+        if swept:
+            return store.swept_overlapping(player_rect, self.player.prev_y, skip_flags)
+        return store.overlapping(player_rect, skip_flags)
+
+    def _find_collisions_legacy(self, player_rect):
+        """Per-rect version of _find_collisions, kept to check the batched path against."""
+        player_is_jumping = self.player.is_jumping
+
+        if not self.is_invincible:
+            for index in range(len(self.obstacles)):
+                obstacle = self.obstacles.row(index)
+                obstacle_config = self.obstacle_types.get(obstacle['type'], {})
+                is_air_obstacle = obstacle_config.get('y_pos', 'ground') == 'air'
 
                 # Skip collision check for air obstacles if player is on the ground
                 if is_air_obstacle and not player_is_jumping:
                     continue
 
-                # Use the existing _check_collision helper method
                 if self._check_collision(player_rect, obstacle):
-                    print(f"Collision detected with {obstacle_type} obstacle at ({obstacle['x']:.0f}, {obstacle['y']:.0f})")
-                    self.game_state = GameState.GAME_OVER
-                    return # Exit early on game over
-        else:
-             # Optional: Add visual feedback for phasing through obstacles
-             pass 
+                    return index, None
 
-        # Check powerup collisions (always check, regardless of invincibility)
-        # Iterate over a copy in case of removal during iteration
-        for power_up in list(self.power_ups):
-            if self._check_collision(player_rect, power_up):
-                self._handle_powerup_collision(power_up) # This prevents activating multiple
-                break # Stop checking after collecting one powerup
+        # Stop checking after the first powerup; only one can be collected per tick
+        for index in range(len(self.power_ups)):
+            if self._check_collision(player_rect, self.power_ups.row(index)):
+                return None, index
+        return None, None
 
     def _update_score(self, dt): # Added dt parameter back
         # Simple score increment, adjust based on game design
         time_based_score = dt * 10 # Example: Score based on time survived
         distance_based_score = 0 # Can calculate based on player movement or obstacle speed
 
-        # Apply multiplier
-        self.score += int((time_based_score + distance_based_score) * self.score_multiplier)
+        # Apply multiplier; carry the fraction over so small per-tick amounts still add up
+        self._score_remainder += (time_based_score + distance_based_score) * self.score_multiplier
+        points = int(self._score_remainder)
+        self.score += points
+        self._score_remainder -= points
 
         # Update distance (example, based on constant speed)
         # Consider using player's actual movement if speed varies
@@ -398,17 +474,28 @@ class GameEngine:
 
         return player_rect.colliderect(item_rect)
 
-    def reset(self):
-        """Reset the game state, integrating resets from managers"""
+    def reset(self, seed=None):
+        """Reset the game state, integrating resets from managers.
+
+        The next game uses `seed` if given (e.g. when replaying a trace),
+        otherwise a fresh seed drawn from seed_source.
+        """
         self.score = 0
+        self._score_remainder = 0.0
         self.distance_traveled = 0
         self.start_time = None # Reset start time
+        self.sim_time = 0.0
+        self.tick_count = 0
+
+        # Start the next game from a fresh seed so it can be replayed on its own
+        self.seed = seed if seed is not None else self.seed_source.randrange(2**32)
+        self.rng.seed(self.seed)
 
         # Reset player state
         self.player.reset()
 
         # Reset obstacles
-        self.obstacles = []
+        self.obstacles.clear()
         self.obstacle_spawn_timer = 0
         # Re-read base speeds from config in case it changed? Or assume constant.
         game_config = self.config.get('game', {})
@@ -422,7 +509,8 @@ class GameEngine:
         self.pattern_queue = []
 
         # Reset powerups
-        self.power_ups = []
+        self.power_ups.clear()
         self._deactivate_powerup() # Resets all powerup effects/states
 
-        print("Game engine reset.") # Unified reset message
\ No newline at end of file
+        if self.verbose:
+            print("Game engine reset.") # Unified reset message
\ No newline at end of file
@@ -33,12 +33,14 @@ class InputHandler:
             elif self.game_engine.game_state == GameState.GAME_OVER:
                 print("DEBUG: Transitioning from GAME_OVER to MENU")
                 self.game_engine.reset()
+                self.renderer.reset_dynamic_resolution()
                 self.game_engine.game_state = GameState.MENU
         elif key == 27:  # ESC
             if self.game_engine.game_state == GameState.PLAYING:
                 self.game_engine.game_state = GameState.MENU
             elif self.game_engine.game_state == GameState.GAME_OVER:
                 self.game_engine.reset()
+                self.renderer.reset_dynamic_resolution()
                 self.game_engine.game_state = GameState.MENU
         elif key == ord('n'):  # Enter name
             self.player_name = input("Enter player name: ")
@@ -1,10 +1,14 @@
 import cv2
 import numpy as np
 import pygame
+import time
 from src.utils.game_utils import GameState
+from src.core.text_cache import TextCache
+from src.core.background import Background
+from src.core.resolution_scaler import ResolutionScaler
 
 class Renderer:
-    def __init__(self, config, asset_manager):
+    def __init__(self, config, asset_manager, surface=None):
         self.config = config
         self.asset_manager = asset_manager
         self.width = config.get('width', 1280)
@@ -16,49 +20,203 @@ class Renderer:
         self.OBSTACLE_COLOR = (255, 0, 0)
         self.POWERUP_COLOR = (255, 255, 0)
         
-        # Background scrolling
-        self.background_x = 0
-        self.background_speed = 2
-        
-        # Initialize Pygame and create window
-        pygame.display.init()
+        # Initialize Pygame. Rendering goes to the surface of the display backend;
+        # without one, compose into a preallocated BGR buffer (e.g. for headless use)
         pygame.font.init()
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption("Head Jump Game")
+        if surface is None:
+            self.frame_buffer = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+            surface = pygame.image.frombuffer(self.frame_buffer, (self.width, self.height), 'BGR')
+        self.screen = surface
+        
+        # Background scrolling: ground and parallax layers are baked into tiles once
+        self.background_speed = 2
+        self.background = Background(config, self.width, self.height, self.height - 100,
+                                     self.GROUND_COLOR, self.background_speed, self.screen)
         
+        # Webcam preview: resized into a preallocated BGR buffer that a pygame surface
+        # wraps without copying, refreshed at its own (lower) rate
+        video_config = config.get('video', {})
+        self.preview_size = (self.width // 4, self.height // 4)
+        self.preview_buffer = np.zeros((self.preview_size[1], self.preview_size[0], 3), dtype=np.uint8)
+        self.preview_surface = pygame.image.frombuffer(self.preview_buffer, self.preview_size, 'BGR')
+        preview_fps = video_config.get('preview_fps', 0)
+        self.preview_interval = 1.0 / preview_fps if preview_fps > 0 else 0.0
+        self.preview_interpolation = {
+            'nearest': cv2.INTER_NEAREST,
+            'linear': cv2.INTER_LINEAR,
+            'area': cv2.INTER_AREA
+        }.get(video_config.get('preview_interpolation', 'nearest'), cv2.INTER_NEAREST)
+        self._last_preview_time = None
+
         # Initialize font
         self.font = pygame.font.Font(None, 36)
+        self.stats_font = pygame.font.Font(None, 22)
+        self.text_cache = TextCache(config.get('video', {}).get('text_cache_size', 256))
+        self._stats_box = None
+
+        # Dirty-rect mode: instead of clearing and presenting the whole screen, only the
+        # regions drawn this frame or last frame (plus the scrolling background bands)
+        # are restored and handed to the display backend
+        self.dirty_rendering = video_config.get('dirty_rects', False)
+        self.screen_rect = self.screen.get_rect()
+        self._frame_rects = []
+        self._previous_rects = []
+        self._needs_full_redraw = True
 
-    def render(self, face_frame, game_state):
-        """Main render function"""
-        # Clear screen with background color
-        self.screen.fill(self.BACKGROUND_COLOR)
+        # Dynamic resolution: the game layer (background, player, obstacles, power-ups)
+        # is drawn at a lower internal resolution when frames run over budget and scaled
+        # up to the window; text, HUD and preview stay at full resolution
+        self.resolution_scaler = None
+        if video_config.get('dynamic_resolution', False):
+            self.resolution_scaler = ResolutionScaler(
+                target_fps=video_config.get('target_fps', 60),
+                min_scale=video_config.get('min_render_scale', 0.5),
+                step=video_config.get('render_scale_step', 0.125)
+            )
+            if self.dirty_rendering:
+                print("Dynamic resolution redraws the whole screen; disabling dirty rects.")
+                self.dirty_rendering = False
+        self._layer = self.screen  # Surface the game layer is drawn on this frame
+        self._layer_scale = 1.0
+        self._game_layers = {}     # scale -> reduced-size surface in the screen's format
+        self._scaled_assets = {}   # (surface, scale) -> resized copy
+
+    def render(self, face_frame, game_state, nose_marker=None):
+        """Main render function.
+
+        nose_marker is an optional ((x, y) normalized, BGR color) drawn on the preview.
+        """
+        self._previous_rects = self._frame_rects
+        self._frame_rects = []
+
+        scale = self.resolution_scaler.scale if self.resolution_scaler else 1.0
+        if scale < 1.0:
+            self._layer = self._get_game_layer(scale)
+            self._layer_scale = scale
+            self._layer.fill(self.BACKGROUND_COLOR)
+        elif self.dirty_rendering and not self._needs_full_redraw:
+            # Restore only what was drawn last frame; the background bands scroll
+            # every frame, so they are always cleared and redrawn
+            for rect in self._previous_rects:
+                self.screen.fill(self.BACKGROUND_COLOR, rect)
+            for rect in self.background.rects:
+                self.screen.fill(self.BACKGROUND_COLOR, rect)
+        else:
+            # Clear screen with background color
+            self.screen.fill(self.BACKGROUND_COLOR)
+        if scale >= 1.0:
+            self._layer = self.screen
+            self._layer_scale = 1.0
         
         # Draw background for all states
-        self._draw_background()
+        self._draw_background(game_state.get('frame_dt', 1 / 60))
+
+        if game_state['state'] in (GameState.PLAYING, GameState.GAME_OVER):
+            self._draw_game_elements(game_state)  # Game over shows the final state
+
+        if self._layer is not self.screen:
+            pygame.transform.scale(self._layer, (self.width, self.height), self.screen)
         
         # Handle different game states
         if game_state['state'] == GameState.MENU:
             self._draw_menu()
         elif game_state['state'] == GameState.PLAYING:
-            self._draw_game_elements(game_state)
+            self._draw_hud(game_state)
         elif game_state['state'] == GameState.GAME_OVER:
-            self._draw_game_elements(game_state)  # Show final state
+            self._draw_hud(game_state)
             self._draw_game_over(game_state['score'])
         
         # Draw face frame if available
         if face_frame is not None:
-            face_surface = self._convert_cv2_to_pygame(face_frame)
+            face_surface = self._update_preview(face_frame, nose_marker)
             self._draw_face_frame(face_surface)
         
-        # Update display
-        pygame.display.flip()
-        
-        # Convert to CV2 format for compatibility
-        return self._pygame_surface_to_cv2(self.screen)
+        # Presenting is up to the display backend that owns self.screen
+        return self.screen
+
+    def _mark(self, rect):
+        """Record a region drawn this frame (for dirty-rect presenting); returns it."""
+        self._frame_rects.append(rect.clip(self.screen_rect))
+        return rect
+
+    def _get_game_layer(self, scale):
+        layer = self._game_layers.get(scale)
+        if layer is None:
+            size = (round(self.width * scale), round(self.height * scale))
+            layer = pygame.Surface(size, 0, self.screen)
+            self._game_layers[scale] = layer
+            self._scaled_assets.clear()  # Copies for other scales are unlikely to be needed soon
+        return layer
+
+    def _scaled(self, surface):
+        """The copy of `surface` matching the current game layer scale."""
+        if self._layer_scale == 1.0:
+            return surface
+        key = (surface, self._layer_scale)
+        scaled = self._scaled_assets.get(key)
+        if scaled is None:
+            w, h = surface.get_size()
+            size = (max(1, round(w * self._layer_scale)), max(1, round(h * self._layer_scale)))
+            scaled = pygame.transform.scale(surface, size)
+            self._scaled_assets[key] = scaled
+        return scaled
+
+    def _blit_world(self, surface, x, y):
+        """Blit a game-layer surface at full-resolution coordinates; returns the screen rect it covers."""
+        scale = self._layer_scale
+        rect = self._layer.blit(self._scaled(surface), (int(x * scale), int(y * scale)))
+        if scale != 1.0:
+            return pygame.Rect(int(x), int(y), surface.get_width(), surface.get_height())
+        return rect
+
+    def _scale_rect(self, rect):
+        scale = self._layer_scale
+        if scale == 1.0:
+            return rect
+        return pygame.Rect(int(rect.x * scale), int(rect.y * scale),
+                           max(1, round(rect.w * scale)), max(1, round(rect.h * scale)))
+
+    def record_frame_time(self, elapsed):
+        """Feed the time a whole frame took to the dynamic resolution controller, if enabled."""
+        if self.resolution_scaler:
+            self.resolution_scaler.record_frame_time(elapsed)
+
+    def reset_dynamic_resolution(self):
+        """Return to full resolution and forget frame-time history (new game, display or camera)."""
+        if self.resolution_scaler:
+            self.resolution_scaler.reset()
+
+    def get_dirty_rects(self):
+        """Regions of the screen changed by the last render, or None if it must be presented whole.
+
+        Call after everything for the frame (including the stats overlay) is drawn.
+        """
+        if not self.dirty_rendering or self._needs_full_redraw:
+            self._needs_full_redraw = False
+            return None
+        return self._merge_rects(self.background.rects + self._previous_rects + self._frame_rects)
+
+    @staticmethod
+    def _merge_rects(rects):
+        """Union overlapping rects so no region is updated twice (sprites overlap their old position)."""
+        merged = []
+        for rect in rects:
+            if not rect.w or not rect.h:
+                continue
+            rect = rect.copy()
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def request_full_redraw(self):
+        """Clear and present the whole screen next frame (e.g. after the surface was drawn on elsewhere)."""
+        self._needs_full_redraw = True
 
     def _draw_game_elements(self, game_state):
-        """Draw all game elements"""
+        """Draw the game layer: player, obstacles and power-ups"""
         # --- Player Drawing with Invincibility Effect ---
         player_sprite = None
         if game_state.get('all_sprites'):
@@ -67,66 +225,74 @@ class Renderer:
                  player_sprite = sprites[0] # Assuming player is the first sprite
 
         is_invincible = game_state.get('is_invincible', False)
-        original_alpha = None
-        if player_sprite and is_invincible:
-            try:
-                # Make player semi-transparent during invincibility
-                original_alpha = player_sprite.image.get_alpha()
-                player_sprite.image.set_alpha(128) # 50% transparent
-            except AttributeError: # Handle if image is not per-pixel alpha
-                print("Warning: Cannot set alpha on player sprite image.")
-                pass 
-        
+        sim_time = game_state.get('sim_time', 0.0)
+        # With a fixed timestep, draw between the previous tick (0.0) and the latest one (1.0)
+        alpha = game_state.get('interpolation', 1.0)
+
         if game_state.get('all_sprites'):
-            game_state['all_sprites'].draw(self.screen) # Draw player (and potentially others)
-
-        # Restore player alpha after drawing
-        if player_sprite and original_alpha is not None:
-             try:
-                 player_sprite.image.set_alpha(original_alpha)
-             except AttributeError:
-                 pass
+            # Draw player (and potentially others)
+            for sprite in game_state['all_sprites']:
+                image = sprite.image
+                if sprite is player_sprite and is_invincible:
+                    # Semi-transparent during invincibility, from a pre-built alpha variant
+                    image = self.asset_manager.get_alpha_variant(image, self.asset_manager.INVINCIBILITY_ALPHA)
+                y = sprite.rect.y
+                if sprite is player_sprite and alpha < 1.0:
+                    y = int(sprite.prev_y + (y - sprite.prev_y) * alpha)
+                self._mark(self._blit_world(image, sprite.rect.x, y))
         # --- End Player Drawing ---
 
         # --- Obstacle Drawing using Assets ---
-        for obstacle in game_state.get('obstacles', []):
-            obstacle_type = obstacle.get('type')
-            asset = self.asset_manager.get_obstacle_asset(obstacle_type)
-            if asset:
-                 # Adjust blit position if asset size differs from obstacle dict size
-                 # For now, assuming asset matches config height/width used in engine
-                 blit_x = int(obstacle['x'])
-                 blit_y = int(obstacle['y'])
-                 self.screen.blit(asset, (blit_x, blit_y))
-            else:
-                 # Fallback: Draw a red rectangle if asset is missing
-                 pygame.draw.rect(self.screen,
-                                (255, 0, 0), # Bright red fallback
-                                pygame.Rect(
-                                    int(obstacle['x']),
-                                    int(obstacle['y']),
-                                    obstacle['width'],
-                                    obstacle['height']
-                                ))
+        # Entities arrive as column arrays; convert each column once instead of every element
+        obstacles = game_state.get('obstacles')
+        if obstacles is not None and len(obstacles):
+            type_names = obstacles.type_names
+            for x, y, width, height, type_id in zip(self._interpolated_x(obstacles, alpha), obstacles.y.tolist(),
+                                                    obstacles.width.tolist(), obstacles.height.tolist(),
+                                                    obstacles.type_id.tolist()):
+                # The frames for this obstacle's height match its collision box
+                asset = self.asset_manager.get_obstacle_frame(type_names[type_id], int(height), sim_time)
+                if asset:
+                     self._mark(self._blit_world(asset, int(x), int(y)))
+                else:
+                     # Fallback: Draw a red rectangle if asset is missing
+                     rect = pygame.Rect(int(x), int(y), int(width), int(height))
+                     pygame.draw.rect(self._layer, (255, 0, 0), self._scale_rect(rect)) # Bright red fallback
+                     self._mark(rect)
         # --- End Obstacle Drawing ---
         
         # --- Powerup Drawing using Assets ---
-        for powerup in game_state.get('power_ups', []):
-            powerup_type = powerup.get('type')
-            asset = self.asset_manager.get_powerup_asset(powerup_type)
-            if asset:
-                blit_x = int(powerup['x'])
-                blit_y = int(powerup['y'])
-                self.screen.blit(asset, (blit_x, blit_y))
-            else:
-                # Fallback: Draw a yellow circle if asset is missing
-                pygame.draw.circle(self.screen,
-                                 self.POWERUP_COLOR, # Default yellow
-                                 (int(powerup['x'] + powerup['width']//2),
-                                  int(powerup['y'] + powerup['height']//2)),
-                                 powerup.get('width', 20) // 2)
+        power_ups = game_state.get('power_ups')
+        if power_ups is not None and len(power_ups):
+            type_names = power_ups.type_names
+            for x, y, width, height, type_id in zip(self._interpolated_x(power_ups, alpha), power_ups.y.tolist(),
+                                                    power_ups.width.tolist(), power_ups.height.tolist(),
+                                                    power_ups.type_id.tolist()):
+                asset = self.asset_manager.get_powerup_frame(type_names[type_id], sim_time)
+                if asset:
+                    self._mark(self._blit_world(asset, int(x), int(y)))
+                else:
+                    # Fallback: Draw a yellow circle if asset is missing
+                    radius = int(width) // 2
+                    rect = pygame.Rect(0, 0, radius * 2, radius * 2)
+                    rect.center = (int(x + int(width) // 2),
+                                   int(y + int(height) // 2))
+                    scaled = self._scale_rect(rect)
+                    pygame.draw.circle(self._layer,
+                                     self.POWERUP_COLOR, # Default yellow
+                                     scaled.center,
+                                     scaled.w // 2)
+                    self._mark(rect)
         # --- End Powerup Drawing ---
-        
+
+    @staticmethod
+    def _interpolated_x(entities, alpha):
+        if alpha >= 1.0:
+            return entities.x.tolist()
+        return (entities.prev_x + (entities.x - entities.prev_x) * alpha).tolist()
+
+    def _draw_hud(self, game_state):
+        """Draw score and power-up info (always at full resolution)"""
         # Draw score
         self._draw_score(game_state['score'])
         
@@ -135,91 +301,63 @@ class Renderer:
 
     def _draw_menu(self):
         """Draw menu screen"""
-        title = self.font.render('Head Jump Game', True, (255, 255, 255))
-        start_text = self.font.render('Press SPACE to Start', True, (255, 255, 255))
+        title = self.text_cache.render(self.font, 'Head Jump Game', (255, 255, 255))
+        start_text = self.text_cache.render(self.font, 'Press SPACE to Start', (255, 255, 255))
         
         title_rect = title.get_rect(center=(self.width//2, self.height//3))
         start_rect = start_text.get_rect(center=(self.width//2, self.height//2))
         
-        self.screen.blit(title, title_rect)
-        self.screen.blit(start_text, start_rect)
+        self._mark(self.screen.blit(title, title_rect))
+        self._mark(self.screen.blit(start_text, start_rect))
 
     def _draw_game_over(self, score):
         """Draw game over screen"""
-        game_over = self.font.render('Game Over', True, (255, 0, 0))
-        score_text = self.font.render(f'Final Score: {score}', True, (255, 255, 255))
-        restart_text = self.font.render('Press SPACE to Restart', True, (255, 255, 255))
+        game_over = self.text_cache.render(self.font, 'Game Over', (255, 0, 0))
+        score_text = self.text_cache.render(self.font, f'Final Score: {score}', (255, 255, 255))
+        restart_text = self.text_cache.render(self.font, 'Press SPACE to Restart', (255, 255, 255))
         
         game_over_rect = game_over.get_rect(center=(self.width//2, self.height//3))
         score_rect = score_text.get_rect(center=(self.width//2, self.height//2))
         restart_rect = restart_text.get_rect(center=(self.width//2, 2*self.height//3))
         
-        self.screen.blit(game_over, game_over_rect)
-        self.screen.blit(score_text, score_rect)
-        self.screen.blit(restart_text, restart_rect)
+        self._mark(self.screen.blit(game_over, game_over_rect))
+        self._mark(self.screen.blit(score_text, score_rect))
+        self._mark(self.screen.blit(restart_text, restart_rect))
 
     def _draw_multiplier(self, multiplier):
         """Draw score multiplier"""
-        multiplier_text = self.font.render(f'x{multiplier}', True, (255, 255, 0))
-        self.screen.blit(multiplier_text, (10, 50))
+        multiplier_text = self.text_cache.render(self.font, f'x{multiplier}', (255, 255, 0))
+        self._mark(self.screen.blit(multiplier_text, (10, 50)))
 
-    def _draw_background(self):
+    def _draw_background(self, frame_dt=1 / 60):
         """Draw the game background"""
-        # Update background position
-        self.background_x = (self.background_x - self.background_speed) % self.width
-        
-        # Draw ground
-        ground_y = self.height - 100
-        pygame.draw.line(self.screen, 
-                        self.GROUND_COLOR,
-                        (0, ground_y),
-                        (self.width, ground_y),
-                        3)
-        
-        # Draw ground pattern
-        for i in range(0, self.width + 20, 20):
-            actual_x = (i + self.background_x) % self.width
-            pygame.draw.line(self.screen,
-                           self.GROUND_COLOR,
-                           (actual_x, ground_y),
-                           (actual_x + 10, ground_y),
-                           3)
+        # Scroll by the real time since the last frame and blit the pre-rendered layers (two blits per layer)
+        self.background.update(frame_dt)
+        self.background.draw(self._layer, self._layer_scale)
 
     def _draw_score(self, score):
         """Draw the score"""
-        score_text = self.font.render(f'Score: {score}', True, (255, 255, 255))
-        self.screen.blit(score_text, (10, 10))
+        label = self.text_cache.render(self.font, 'Score: ', (255, 255, 255))
+        self._mark(self.screen.blit(label, (10, 10)))
+        # Digits come from the glyph atlas so a changing score does not churn the text cache
+        self._mark(self.text_cache.draw_number(self.screen, self.font, score, (255, 255, 255), (10 + label.get_width(), 10)))
 
-    def _convert_cv2_to_pygame(self, cv2_image):
-        """Convert OpenCV image to Pygame surface"""
-        if cv2_image is None:
-            return None
-            
-        # Resize face frame
-        face_height = self.height // 4
-        face_width = self.width // 4
-        cv2_image = cv2.resize(cv2_image, (face_width, face_height))
-        
-        # Convert from BGR to RGB
-        cv2_image = cv2.cvtColor(cv2_image, cv2.COLOR_BGR2RGB)
-        
-        # Create Pygame surface
-        shape = cv2_image.shape[1::-1]  # width, height
-        return pygame.image.frombuffer(cv2_image.tobytes(), shape, 'RGB')
-
-    def _pygame_surface_to_cv2(self, pygame_surface):
-        """Convert Pygame surface to OpenCV image (for compatibility)"""
-        # Get the size of the surface
-        size = pygame_surface.get_size()
-        
-        # Get raw pixel data
-        view = pygame.surfarray.array3d(pygame_surface)
-        
-        # Convert from RGB to BGR
-        view = view.transpose([1, 0, 2])
-        img_bgr = cv2.cvtColor(view, cv2.COLOR_RGB2BGR)
-        
-        return img_bgr
+    def _update_preview(self, cv2_image, nose_marker=None):
+        """Refresh the webcam preview surface from an OpenCV image, at most at preview_fps"""
+        now = time.perf_counter()
+        if self._last_preview_time is not None and now - self._last_preview_time < self.preview_interval:
+            return self.preview_surface
+        self._last_preview_time = now
+
+        # Resize straight into the buffer behind preview_surface: no conversion, no new surface
+        cv2.resize(cv2_image, self.preview_size, dst=self.preview_buffer, interpolation=self.preview_interpolation)
+
+        if nose_marker is not None:
+            (nose_x, nose_y), color = nose_marker
+            center = (int(nose_x * self.preview_size[0]), int(nose_y * self.preview_size[1]))
+            cv2.circle(self.preview_buffer, center, 3, color, -1)
+
+        return self.preview_surface
 
     def _draw_face_frame(self, face_surface):
         """Draw the face frame in the corner"""
@@ -231,7 +369,21 @@ class Renderer:
         y_offset = 10
         
         # Draw face frame
-        self.screen.blit(face_surface, (x_offset, y_offset))
+        self._mark(self.screen.blit(face_surface, (x_offset, y_offset)))
+
+    def draw_stats_overlay(self, lines):
+        """Draw statistics lines on a translucent dark box in the top-left corner"""
+        box_w = 190
+        box_h = len(lines) * 25 + 10
+        # Darken the box area (60% black overlay); the box surface is reused while its size holds
+        if self._stats_box is None or self._stats_box.get_height() != box_h:
+            self._stats_box = pygame.Surface((box_w, box_h))
+            self._stats_box.set_alpha(153)
+        self._mark(self.screen.blit(self._stats_box, (10, 10)))
+
+        for i, line in enumerate(lines):
+            text = self.text_cache.render(self.stats_font, line, (255, 255, 255))
+            self._mark(self.screen.blit(text, (20, 22 + i * 25)))
 
     def cleanup(self):
         """Clean up resources"""
@@ -245,21 +397,21 @@ class Renderer:
         multiplier = game_state.get('score_multiplier', 1.0)
         if multiplier > 1.0:
             color = self.config.get('powerup', {}).get('types', {}).get('score_boost', {}).get('color', (255, 255, 0))
-            multiplier_text = self.font.render(f'Score x{multiplier:.1f}', True, tuple(color))
-            self.screen.blit(multiplier_text, (10, y_offset))
+            multiplier_text = self.text_cache.render(self.font, f'Score x{multiplier:.1f}', tuple(color))
+            self._mark(self.screen.blit(multiplier_text, (10, y_offset)))
             y_offset += 30
             
         # Draw invincibility indicator
         if game_state.get('is_invincible', False):
             color = self.config.get('powerup', {}).get('types', {}).get('invincibility', {}).get('color', (0, 255, 255))
-            invincibility_text = self.font.render('Invincible!', True, tuple(color))
-            self.screen.blit(invincibility_text, (10, y_offset))
+            invincibility_text = self.text_cache.render(self.font, 'Invincible!', tuple(color))
+            self._mark(self.screen.blit(invincibility_text, (10, y_offset)))
             y_offset += 30
             
         # Draw slow motion indicator
         slow_factor = game_state.get('slow_motion_factor', 1.0)
         if slow_factor < 1.0:
             color = self.config.get('powerup', {}).get('types', {}).get('slow_motion', {}).get('color', (255, 0, 255))
-            slow_text = self.font.render(f'Slow Motion ({slow_factor:.1f}x)', True, tuple(color))
-            self.screen.blit(slow_text, (10, y_offset))
+            slow_text = self.text_cache.render(self.font, f'Slow Motion ({slow_factor:.1f}x)', tuple(color))
+            self._mark(self.screen.blit(slow_text, (10, y_offset)))
             y_offset += 30
\ No newline at end of file
@@ -0,0 +1,95 @@
+class ResolutionScaler:
+    """Picks the internal render scale of the game layer from measured frame times.
+
+    The scale moves in fixed steps between `min_scale` and 1.0 so only a few
+    resolutions (and their cached assets) ever exist. It is lowered while the
+    smoothed frame time is over the frame budget and raised again once there
+    is `headroom` to spare, waiting `cooldown_frames` after each change so the
+    new cost can show up in the average before the next decision. A step down
+    that does not make frames at least `min_gain` faster is undone and becomes
+    the floor: the time is going somewhere else (e.g. face inference) and a
+    blurrier picture would buy nothing. That only holds while the load stays
+    the same, so the floor is lifted again after `floor_periods` cooldown
+    periods, or sooner once the average frame time drifts more than
+    `floor_drift` (a fraction) from what it was when the floor was set.
+    """
+
+    def __init__(self, target_fps=60, min_scale=0.5, step=0.125, headroom=0.75,
+                 cooldown_frames=30, smoothing=0.1, min_gain=0.05, floor_periods=10,
+                 floor_drift=0.25):
+        self.frame_budget = 1.0 / max(1, target_fps)
+        self.step = step
+        self.min_scale = max(step, min(1.0, min_scale))
+        self.headroom = headroom
+        self.cooldown_frames = cooldown_frames
+        self.smoothing = smoothing  # EMA weight for new measurements
+        self.min_gain = min_gain
+        self.floor_periods = floor_periods
+        self.floor_drift = floor_drift
+
+        self.scale = 1.0
+        self.floor = self.min_scale
+        self.avg_frame_time = None
+        self._cooldown = cooldown_frames
+        self._time_before_drop = None
+        self._floor_frames = 0     # Frames left until a raised floor is lifted
+        self._floor_time = None    # avg_frame_time when the floor was raised
+        self.scale_changes = 0
+
+    def record_frame_time(self, elapsed):
+        """Feed back how long a whole frame took; may change `scale` for the next one."""
+        if self.avg_frame_time is None:
+            self.avg_frame_time = elapsed
+        else:
+            self.avg_frame_time += self.smoothing * (elapsed - self.avg_frame_time)
+
+        if self.floor > self.min_scale:
+            self._floor_frames -= 1
+            if self._floor_frames <= 0 or abs(self.avg_frame_time - self._floor_time) > self._floor_time * self.floor_drift:
+                self._clear_floor()
+
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return
+
+        if self._time_before_drop is not None:
+            ineffective = self.avg_frame_time > self._time_before_drop * (1.0 - self.min_gain)
+            self._time_before_drop = None
+            if ineffective:
+                self._set_scale(self.scale + self.step)
+                self.floor = self.scale
+                self._floor_frames = self.floor_periods * max(1, self.cooldown_frames)
+                self._floor_time = self.avg_frame_time
+                return
+
+        if self.avg_frame_time > self.frame_budget and self.scale > self.floor:
+            self._time_before_drop = self.avg_frame_time
+            self._set_scale(max(self.floor, self.scale - self.step))
+        elif self.avg_frame_time < self.frame_budget * self.headroom and self.scale < 1.0:
+            self._set_scale(min(1.0, self.scale + self.step))
+
+    def _set_scale(self, scale):
+        self.scale = 1.0 if scale >= 1.0 else max(self.min_scale, round(scale / self.step) * self.step)
+        self._cooldown = self.cooldown_frames
+        self.scale_changes += 1
+
+    def _clear_floor(self):
+        self.floor = self.min_scale
+        self._floor_frames = 0
+        self._floor_time = None
+
+    def reset(self):
+        """Start over at full resolution, e.g. when the game, display or camera changes."""
+        self.scale = 1.0
+        self.avg_frame_time = None
+        self._cooldown = self.cooldown_frames
+        self._time_before_drop = None
+        self._clear_floor()
+
+    def get_stats(self):
+        return {
+            'scale': self.scale,
+            'floor': self.floor,
+            'avg_frame_ms': (self.avg_frame_time or 0.0) * 1000,
+            'scale_changes': self.scale_changes
+        }
@@ -0,0 +1,122 @@
+import random
+import time
+
+import numpy as np
+
+from src.core.engine import GameEngine
+from src.entities.entity_store import EntityStore
+from src.utils.config_manager import ConfigManager
+from src.utils.game_utils import GameState
+
+
+class JumpBot:
+    """Stand-in for the player's face: nods to jump over obstacles on the ground.
+
+    It produces normalized nose points the way the face tracker does, so its
+    jumps go through the same smoothing and threshold as a real player's.
+    Each jump starts when the next ground obstacle is `lead` seconds away, with
+    the lead drawn around `reaction_time` per jump; the spread is what turns
+    one config into a distribution of outcomes. Air obstacles are ignored,
+    since they only hit a jumping player.
+    """
+
+    REST_Y = 0.5
+
+    def __init__(self, reaction_time=0.15, reaction_jitter=0.05, nod=0.2, nod_ticks=4):
+        self.reaction_time = reaction_time
+        self.reaction_jitter = reaction_jitter
+        self.nod = nod  # How far the nose moves up, as a fraction of the frame height
+        self.nod_ticks = nod_ticks
+        self.rng = random.Random()
+        self._nod_left = 0
+        self._lead = reaction_time
+
+    def reset(self, seed):
+        """Start a game; the bot's own RNG is derived from the game seed so runs repeat exactly."""
+        self.rng.seed(f"bot:{seed}")
+        self._nod_left = 0
+        self._lead = self._draw_lead()
+
+    def _draw_lead(self):
+        return self.rng.gauss(self.reaction_time, self.reaction_jitter)
+
+    def nose_point(self, engine):
+        """Nose point to feed into the next GameEngine.update."""
+        nodding = (0.5, self.REST_Y - self.nod)
+        if self._nod_left > 0:
+            self._nod_left -= 1
+            return nodding
+
+        player = engine.player
+        obstacles = engine.obstacles  # Read the store's columns directly; a view per tick costs more than the rest
+        n = len(obstacles)
+        speed = engine.current_obstacle_speed * engine.slow_motion_factor * 60  # Pixels per second
+        if not player.is_jumping and n and speed > 0:
+            x = obstacles.x[:n]
+            ahead = (x + obstacles.width[:n] > player.rect.left) & ((obstacles.flags[:n] & EntityStore.FLAG_AIR) == 0)
+            if ahead.any():
+                distance = x[ahead].min() - player.rect.right
+                if distance / speed <= self._lead:
+                    self._nod_left = self.nod_ticks - 1
+                    self._lead = self._draw_lead()
+                    return nodding
+        return (0.5, self.REST_Y)
+
+
+def simulate_games(config, games, seed=None, max_seconds=300.0, bot=None):
+    """Play `games` games headless (no display, assets or camera) with a bot.
+
+    Ticks are fixed at game.tick_rate. Games still running after `max_seconds`
+    of simulated time are stopped. Returns one summary dict per game; with the
+    same `seed` the results are identical.
+    """
+    engine = GameEngine(config, seed=seed, verbose=False)
+    bot = bot or JumpBot()
+    tick_rate = config.get('game', {}).get('tick_rate', 60) or 60
+    dt = 1.0 / tick_rate
+    max_ticks = int(max_seconds * tick_rate)
+
+    results = []
+    for _ in range(games):
+        engine.reset()
+        engine.game_state = GameState.PLAYING
+        bot.reset(engine.seed)
+        while engine.game_state == GameState.PLAYING and engine.tick_count < max_ticks:
+            engine.update(dt, bot.nose_point(engine))
+        results.append({
+            'seed': engine.seed,
+            'ticks': engine.tick_count,
+            'sim_time': engine.sim_time,
+            'score': engine.score,
+            'game_over': engine.game_state == GameState.GAME_OVER
+        })
+    return results
+
+
+def _distribution_line(label, values):
+    p10, p25, p50, p75, p90 = np.percentile(values, [10, 25, 50, 75, 90])
+    return (f"{label:<14}{values.mean():>9.1f}{values.std():>9.1f}{values.min():>9.1f}"
+            f"{p10:>9.1f}{p25:>9.1f}{p50:>9.1f}{p75:>9.1f}{p90:>9.1f}{values.max():>9.1f}")
+
+
+def run_simulation(games, config_path='config.json', seed=None, max_seconds=300.0):
+    """CLI driver: simulate many games and print survival and score distributions."""
+    config = ConfigManager(config_path).config
+    print(f"Simulating {games} games (seed={seed}, limit {max_seconds:.0f}s per game)...")
+
+    start = time.perf_counter()
+    results = simulate_games(config, games, seed=seed, max_seconds=max_seconds)
+    wall_time = time.perf_counter() - start
+
+    survival = np.array([r['sim_time'] for r in results])
+    scores = np.array([r['score'] for r in results], dtype=np.float64)
+    game_overs = sum(r['game_over'] for r in results)
+
+    print(f"Simulated {survival.sum():.0f}s of play in {wall_time:.2f}s "
+          f"({games / wall_time:.1f} games/s, {survival.sum() / wall_time:.0f}x real time)")
+    print(f"Game over: {game_overs}/{games} (the rest reached the time limit)")
+    print(f"{'':<14}" + "".join(f"{name:>9}" for name in ('mean', 'std', 'min', 'p10', 'p25', 'p50', 'p75', 'p90', 'max')))
+    print(_distribution_line('Survival (s)', survival))
+    print(_distribution_line('Score', scores))
+
+    return results
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces.
+
+    Static and slowly changing strings (menu, labels, power-up info) are
+    rasterized once and reused. Numbers that change every few frames, like
+    the score, are drawn from a per-font glyph atlas of digits instead, so
+    they never fill the cache with one-off surfaces.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._glyphs = {}  # (font, color, char) -> Surface, for number drawing
+
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True) -> pygame.Surface:
+        """Return the surface for `text`, rendering it only on a cache miss."""
+        key = (font, text, tuple(color), antialias)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._entries[key] = surface
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surface
+
+    def _glyph(self, font, char, color):
+        key = (font, tuple(color), char)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            glyph = font.render(char, True, color)
+            self._glyphs[key] = glyph
+        return glyph
+
+    def draw_number(self, target, font, value, color, pos):
+        """Blit an integer glyph by glyph at `pos` (top-left); returns the drawn rect."""
+        x, y = pos
+        start_x = x
+        height = 0
+        for char in str(value):
+            glyph = self._glyph(font, char, color)
+            target.blit(glyph, (x, y))
+            x += glyph.get_width()
+            height = max(height, glyph.get_height())
+        return pygame.Rect(start_x, y, x - start_x, height)
+
+    def clear(self):
+        self._entries.clear()
+        self._glyphs.clear()
+
+    def get_stats(self):
+        return {
+            'entries': len(self._entries),
+            'glyphs': len(self._glyphs),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,55 @@
+import math
+
+
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed-length simulation ticks.
+
+    Real time accumulates and is spent in steps of `dt = 1 / tick_rate`, so the
+    game advances at the same rate however fast (or slowly) frames are drawn.
+    The leftover of less than one tick becomes `alpha`, how far the current
+    moment lies between the last two ticks, which the renderer uses to
+    interpolate positions. At most `max_ticks` run per frame; time beyond that
+    is dropped so a long stall slows the game down once instead of making
+    every following frame slower still.
+    """
+
+    def __init__(self, tick_rate=60, max_ticks=5):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_ticks = max(1, max_ticks)
+
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.ticks = 0
+        self.dropped_time = 0.0
+
+    def advance(self, frame_time):
+        """Add `frame_time` seconds of real time; returns how many ticks to run now."""
+        self.accumulator += max(0.0, frame_time)
+        ticks = 0
+        while self.accumulator >= self.dt and ticks < self.max_ticks:
+            self.accumulator -= self.dt
+            ticks += 1
+
+        if self.accumulator >= self.dt:
+            # Too far behind to catch up: keep only the fraction of a tick
+            remainder = math.fmod(self.accumulator, self.dt)
+            self.dropped_time += self.accumulator - remainder
+            self.accumulator = remainder
+
+        self.alpha = self.accumulator / self.dt
+        self.ticks += ticks
+        return ticks
+
+    def reset(self):
+        """Forget accumulated time, e.g. while the game is not running."""
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+    def get_stats(self):
+        return {
+            'tick_rate': self.tick_rate,
+            'ticks': self.ticks,
+            'alpha': self.alpha,
+            'dropped_ms': self.dropped_time * 1000
+        }
@@ -0,0 +1,255 @@
+from typing import NamedTuple, List
+
+import numpy as np
+
+
+def _overlap_times(start, velocity, lower, upper):
+    """Open time interval (enter, leave) during which lower < start + velocity * t < upper."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_lower = (lower - start) / velocity
+        t_upper = (upper - start) / velocity
+    moving = velocity != 0
+    inside = (start > lower) & (start < upper)  # Only decides the outcome when not moving
+    enter = np.where(moving, np.minimum(t_lower, t_upper), np.where(inside, -np.inf, np.inf))
+    leave = np.where(moving, np.maximum(t_lower, t_upper), np.where(inside, np.inf, -np.inf))
+    return enter, leave
+
+
+class EntityView(NamedTuple):
+    """Read-only window onto the live rows of an EntityStore (valid until its next update)."""
+    x: np.ndarray
+    prev_x: np.ndarray
+    y: np.ndarray
+    width: np.ndarray
+    height: np.ndarray
+    speed: np.ndarray
+    type_id: np.ndarray
+    flags: np.ndarray
+    type_names: List[str]
+
+    def __len__(self):
+        return len(self.x)
+
+
+class EntityStore:
+    """Obstacles or power-ups as a struct of NumPy arrays, one row per entity.
+
+    Rows are kept packed in spawn order, so [:len(store)] of every column is
+    the live set. Movement and culling work on whole columns; capacity
+    doubles when full, so spawning does not reallocate every time.
+
+    Everything in a store moves by the same amount and spawns at the right
+    edge, so spawn order is normally also x order; the store tracks whether
+    that still holds so collision queries can binary-search the x column.
+    """
+
+    FLAG_AIR = 1  # Air obstacle: only collides with a jumping player
+
+    COLUMNS = ('x', 'prev_x', 'y', 'width', 'height', 'speed', 'type_id', 'flags')
+
+    _NO_HITS = np.empty(0, dtype=np.intp)
+
+    def __init__(self, type_names=(), capacity=64):
+        self.type_names = list(type_names)
+        self._type_ids = {name: i for i, name in enumerate(self.type_names)}
+        self.count = 0
+        self._x_sorted = True  # Rows are in ascending x order (moves and removals keep it)
+        self._widest = 0.0  # Upper bound on width since the last clear, for the broadphase
+        self._max_shift = 0.0  # Largest x - prev_x distance of any row
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity):
+        old = {name: getattr(self, name, None) for name in self.COLUMNS}
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.prev_x = np.zeros(capacity, dtype=np.float64)  # x before the last move()
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.width = np.zeros(capacity, dtype=np.float64)
+        self.height = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.type_id = np.zeros(capacity, dtype=np.int32)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        if old['x'] is not None:
+            for name in self.COLUMNS:
+                getattr(self, name)[:self.count] = old[name][:self.count]
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def __len__(self):
+        return self.count
+
+    def type_id_for(self, type_name):
+        type_id = self._type_ids.get(type_name)
+        if type_id is None:
+            type_id = len(self.type_names)
+            self.type_names.append(type_name)
+            self._type_ids[type_name] = type_id
+        return type_id
+
+    def add(self, type_name, x, y, width, height, speed, flags=0):
+        """Append an entity; returns its row index."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        if i and x < self.x[i - 1]:
+            self._x_sorted = False
+        self._widest = max(self._widest, width)
+        self.x[i] = x
+        self.prev_x[i] = x
+        self.y[i] = y
+        self.width[i] = width
+        self.height[i] = height
+        self.speed[i] = speed
+        self.type_id[i] = self.type_id_for(type_name)
+        self.flags[i] = flags
+        self.count += 1
+        return i
+
+    def move(self, dx, speed):
+        """Shift every entity left by dx and record the speed it moved at."""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.x[:n] -= dx
+        self._max_shift = abs(dx)
+        self.speed[:n] = speed
+
+    def cull(self):
+        """Drop entities that have left the screen on the left; keeps spawn order."""
+        n = self.count
+        if n == 0:
+            return
+        keep = self.x[:n] + self.width[:n] > 0
+        if not keep.all():
+            self._compact(keep)
+
+    def remove(self, index):
+        keep = np.ones(self.count, dtype=bool)
+        keep[index] = False
+        self._compact(keep)
+
+    def _compact(self, keep):
+        n = self.count
+        kept = int(keep.sum())
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[:n][keep]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+        self._x_sorted = True
+        self._widest = 0.0
+        self._max_shift = 0.0
+
+    def _candidates(self, lower, upper):
+        """Broadphase: rows whose x lies strictly between lower and upper.
+
+        Returns (candidates, order), where candidates indexes the columns (a
+        slice when rows are in x order, else row indices) and order is the
+        argsort used, or None. Returns None when nothing is in range.
+        """
+        x = self.x[:self.count]
+        order = None
+        if not self._x_sorted:
+            order = x.argsort(kind='stable')
+            x = x[order]
+        lo = int(x.searchsorted(lower, side='right'))
+        hi = int(x.searchsorted(upper, side='left'))
+        if lo >= hi:
+            return None
+        # Sorted rows need no gather: the candidates are a contiguous slice
+        return (slice(lo, hi) if order is None else order[lo:hi]), order
+
+    def _hit_rows(self, candidates, order, hit, skip_flags):
+        if skip_flags:
+            hit &= (self.flags[candidates] & skip_flags) == 0
+        if order is None:
+            return hit.nonzero()[0] + candidates.start
+        hits = candidates[hit]
+        hits.sort()
+        return hits
+
+    def overlapping(self, rect, skip_flags=0):
+        """Row indices, in spawn order, of entities whose box overlaps `rect`.
+
+        Gives the same answer as pygame.Rect.colliderect against a Rect built
+        from each row: positions and sizes truncate toward zero and empty
+        boxes never collide. Rows with any of `skip_flags` set are ignored.
+
+        Broadphase: with the x column sorted, only rows whose left edge lies
+        between rect.left minus the widest entity and rect.right can overlap,
+        and that slice is found with two binary searches. The exact AABB test
+        then runs vectorized over the slice alone.
+        """
+        if self.count == 0 or rect.width <= 0 or rect.height <= 0:
+            return self._NO_HITS
+        # One pixel of slack on both sides covers truncation of negative positions
+        found = self._candidates(rect.left - self._widest - 1, rect.right + 1)
+        if found is None:
+            return self._NO_HITS
+        candidates, order = found
+
+        left = np.trunc(self.x[candidates])
+        top = np.trunc(self.y[candidates])
+        width = np.trunc(self.width[candidates])
+        height = np.trunc(self.height[candidates])
+        hit = ((width > 0) & (height > 0)
+               & (left < rect.right) & (left + width > rect.left)
+               & (top < rect.bottom) & (top + height > rect.top))
+        return self._hit_rows(candidates, order, hit, skip_flags)
+
+    def swept_overlapping(self, rect, prev_top, skip_flags=0):
+        """Like overlapping(), but over the whole last tick instead of only its end.
+
+        Each entity moved in a straight line from prev_x to x while `rect`
+        (the player) moved vertically from `prev_top` to rect.top. A row is
+        hit if at some moment of the tick its box overlaps the rect on both
+        axes, so a fast entity or a long tick cannot carry it straight past
+        the player. At the end of the tick this is exactly overlapping(), so
+        every hit that reports is found here too.
+        """
+        if self.count == 0 or rect.width <= 0 or rect.height <= 0:
+            return self._NO_HITS
+        shift = self._max_shift + 1
+        found = self._candidates(rect.left - self._widest - shift, rect.right + shift)
+        if found is None:
+            return self._NO_HITS
+        candidates, order = found
+
+        start_x = np.trunc(self.prev_x[candidates])
+        end_x = np.trunc(self.x[candidates])
+        top = np.trunc(self.y[candidates])
+        width = np.trunc(self.width[candidates])
+        height = np.trunc(self.height[candidates])
+        # Times in the tick (0 = start, 1 = end) when each axis overlaps
+        x_enter, x_leave = _overlap_times(start_x, end_x - start_x, rect.left - width, rect.right)
+        y_enter, y_leave = _overlap_times(prev_top, rect.top - prev_top, top - rect.height, top + height)
+        enter = np.maximum(x_enter, y_enter)
+        leave = np.minimum(x_leave, y_leave)
+        hit = (width > 0) & (height > 0) & (enter < leave) & (enter < 1.0) & (leave > 0.0)
+        return self._hit_rows(candidates, order, hit, skip_flags)
+
+    def type_name(self, index):
+        return self.type_names[self.type_id[index]]
+
+    def row(self, index):
+        """One entity as a dict, in the shape the engine used before the store existed."""
+        return {
+            'x': float(self.x[index]),
+            'y': float(self.y[index]),
+            'width': int(self.width[index]),
+            'height': int(self.height[index]),
+            'speed': float(self.speed[index]),
+            'type': self.type_name(index)
+        }
+
+    def view(self) -> EntityView:
+        """Read-only arrays over the live rows, for drawing."""
+        n = self.count
+        columns = []
+        for name in self.COLUMNS:
+            column = getattr(self, name)[:n]
+            column.flags.writeable = False  # Only the slice is read-only; the store keeps writing
+            columns.append(column)
+        return EntityView(*columns, self.type_names)
@@ -4,11 +4,12 @@ from collections import deque
 class Player(pygame.sprite.Sprite):
     """Represents the player character in the game."""
 
-    def __init__(self, config, asset_manager):
-        """Initialize the player."""
+    def __init__(self, config, asset_manager=None, verbose=True):
+        """Initialize the player. Without an asset_manager (headless) only the rect matters."""
         super().__init__()
         self.config = config
         self.asset_manager = asset_manager # Store asset_manager
+        self.verbose = verbose
         
         player_config = config.get('player', {})
         game_config = config.get('game', {})
@@ -18,18 +19,23 @@ class Player(pygame.sprite.Sprite):
         self.size = player_config.get('size', 50)
         
         # Get player asset from AssetManager
-        player_asset = self.asset_manager.get_player_asset()
+        player_asset = self.asset_manager.get_player_asset() if self.asset_manager is not None else None
         if player_asset:
-             self.original_image = player_asset # Keep original for effects
-             self.image = self.original_image.copy()
+             self.original_image = player_asset # Shared asset; effects use cached variants, never modify it
+             self.image = self.original_image
         else:
              # Fallback to generating a simple surface if asset is missing
-             print("Warning: Player asset not found, creating fallback.")
+             if self.asset_manager is not None:
+                 print("Warning: Player asset not found, creating fallback.")
              self.image = pygame.Surface([self.size, self.size], pygame.SRCALPHA)
              self.image.fill(tuple(player_config.get('color', (0, 255, 0))))
              self.original_image = self.image # Treat fallback as original
              
         self.rect = self.image.get_rect()
+
+        # Animation: frames come pre-built from AssetManager and are picked by simulation time
+        self.animation_state = 'run'
+        self.animation_start = 0.0
         
         # Movement Attributes
         self.rect.x = player_config.get('initial_x', 100)
@@ -39,16 +45,28 @@ class Player(pygame.sprite.Sprite):
         self.gravity = game_config.get('gravity', 2.0)
         self.jump_strength = game_config.get('jump_strength', -25) # Base jump strength
         self.is_jumping = False
+        # Where the last update() started, for continuous collision over the whole tick
+        self.prev_y = self.rect.y
+        self.was_jumping = False
 
         # Input Smoothing
         self.nose_y_history = deque(maxlen=player_config.get('smoothing_window', 3)) # Configurable smoothing window
         self.prev_smoothed_y = None
-        self.movement_threshold = player_config.get('jump_threshold', 30) # Renamed for clarity
+        # Nose points arrive normalized to [0, 1], so pixel thresholds from the config are
+        # expressed relative to the video height to stay independent of camera/inference resolution
+        self.reference_height = video_config.get('height', 720)
+        pixel_threshold = player_config.get('jump_threshold', game_config.get('movement_threshold', 30))
+        self.movement_threshold = pixel_threshold / self.reference_height
 
     def update(self, dt, nose_point=None):
-        """Update the player's state based on nose input and physics."""
+        """Update the player's state based on nose input and physics.
+
+        nose_point is (x, y) normalized to [0, 1] of the camera frame, or None.
+        """
         smoothed_y = None
         current_jump_strength = self.jump_strength # Default to base strength
+        self.prev_y = self.rect.y
+        self.was_jumping = self.is_jumping
 
         if nose_point is not None:
             current_y = nose_point[1]
@@ -71,11 +89,11 @@ class Player(pygame.sprite.Sprite):
                 if self.config.get('player', {}).get('variable_jump_enabled', False):
                      # Calculate how much the threshold was exceeded
                      exceed_amount = -movement - self.movement_threshold
-                     # Normalize this amount (e.g., threshold=30, movement=-50 -> exceed=20)
+                     # Normalize this amount (e.g., threshold=30px, movement=-50px -> exceed=20px)
                      # Max boost factor (e.g., 0.3 means up to 30% stronger jump)
                      max_boost_factor = self.config.get('player', {}).get('variable_jump_boost', 0.2)
-                     # Scale factor (how quickly boost increases with faster movement)
-                     boost_scale = self.config.get('player', {}).get('variable_jump_scale', 50.0)
+                     # Scale factor (how quickly boost increases with faster movement), pixels at video height
+                     boost_scale = self.config.get('player', {}).get('variable_jump_scale', 50.0) / self.reference_height
                      # Calculate boost modifier (capped between 0 and max_boost_factor)
                      variable_jump_mod = max(0, min(max_boost_factor, exceed_amount / boost_scale))
                      # Apply the boost (making jump_strength more negative)
@@ -87,7 +105,8 @@ class Player(pygame.sprite.Sprite):
                     # Use the potentially modified jump strength
                     self.jump_velocity = current_jump_strength
                     self.is_jumping = True
-                    print(f"Jump triggered! Smoothed Movement: {movement:.2f}, Strength: {self.jump_velocity:.2f}") # Debug
+                    if self.verbose:
+                        print(f"Jump triggered! Smoothed Movement: {movement * self.reference_height:.2f}px, Strength: {self.jump_velocity:.2f}") # Debug
 
 
                 # Update previous smoothed position for the next frame
@@ -107,7 +126,8 @@ class Player(pygame.sprite.Sprite):
                 self.rect.bottom = self.ground_level
                 self.jump_velocity = 0
                 self.is_jumping = False
-                print("Landed.") # Debug
+                if self.verbose:
+                    print("Landed.") # Debug
 
     def get_state(self):
         """Return the player's current state (e.g., jumping, position)."""
@@ -134,17 +154,35 @@ class Player(pygame.sprite.Sprite):
         # Reset movement state
         self.jump_velocity = 0
         self.is_jumping = False
+        self.prev_y = self.rect.y
+        self.was_jumping = False
         
         # Reset input smoothing
         self.nose_y_history.clear()
         self.prev_smoothed_y = None
         
-        # Reset image (in case effects were applied, e.g., transparency)
+        # Reset image (in case it was swapped, e.g., for an animation frame)
         if hasattr(self, 'original_image'):
-            self.image = self.original_image.copy()
+            self.image = self.original_image
+        self.animation_state = 'run'
+        self.animation_start = 0.0
         
-        print("Player state reset.") # Debug
-
-    # Add this if you implement sprite sheets later
-    # def set_animation_state(self, state):
-    #    pass # Implement based on improve.md examples 
\ No newline at end of file
+        if self.verbose:
+            print("Player state reset.") # Debug
+
+    def set_animation_state(self, state, sim_time=0.0):
+        """Switch to the 'idle', 'run' or 'jump' animation; it restarts from its first frame."""
+        if state != self.animation_state:
+            self.animation_state = state
+            self.animation_start = sim_time
+
+    def animate(self, sim_time, state=None):
+        """Show the animation frame for `sim_time` (state defaults to jump/run from the physics)."""
+        if state is None:
+            state = 'jump' if self.is_jumping else 'run'
+        self.set_animation_state(state, sim_time)
+        if self.asset_manager is None:
+            return
+        animation = self.asset_manager.get_animation(f'player:{state}')
+        if animation is not None:
+            self.image = animation.frame_at(sim_time - self.animation_start) 
\ No newline at end of file
@@ -0,0 +1,92 @@
+import math
+
+
+class DetectionScheduler:
+    """Decides on which frames face detection runs.
+
+    With adaptive=False this is the fixed "every N frames" cadence. With
+    adaptive=True the interval is derived from the measured inference cost so
+    that the amortized cost per frame stays within `budget_fraction` of the
+    frame budget, and it is relaxed by one step while the head is still and
+    tightened again as soon as it moves.
+    """
+
+    def __init__(self, target_fps=60, interval=1, adaptive=False, max_interval=6,
+                 budget_fraction=0.5, motion_threshold=0.5, smoothing=0.2):
+        self.frame_budget = 1.0 / max(1, target_fps)
+        self.min_interval = max(1, interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.adaptive = adaptive
+        self.budget_fraction = budget_fraction
+        self.motion_threshold = motion_threshold  # Normalized nose units per second
+        self.smoothing = smoothing                # EMA weight for new measurements
+
+        self.interval = self.min_interval
+        self._counter = 0
+
+        self.avg_inference_time = None
+        self.avg_motion = 0.0
+        self._last_nose_point = None
+        self._last_nose_time = None
+
+        self.frames_seen = 0
+        self.budget_misses = 0
+
+    def should_run(self):
+        """Advance by one new frame and report whether detection should run on it."""
+        self._counter += 1
+        if self._counter >= self.interval:
+            self._counter = 0
+            return True
+        return False
+
+    def record_inference(self, elapsed, nose_point=None, timestamp=None):
+        """Feed back the cost of one inference run and the nose point it produced."""
+        if self.avg_inference_time is None:
+            self.avg_inference_time = elapsed
+        else:
+            self.avg_inference_time += self.smoothing * (elapsed - self.avg_inference_time)
+
+        if nose_point is not None and timestamp is not None:
+            if self._last_nose_point is not None and timestamp > self._last_nose_time:
+                dx = nose_point[0] - self._last_nose_point[0]
+                dy = nose_point[1] - self._last_nose_point[1]
+                speed = math.hypot(dx, dy) / (timestamp - self._last_nose_time)
+                self.avg_motion += self.smoothing * (speed - self.avg_motion)
+            self._last_nose_point = nose_point
+            self._last_nose_time = timestamp
+        elif nose_point is None:
+            # Face lost: detect as often as the budget allows to reacquire it
+            self._last_nose_point = None
+            self.avg_motion = self.motion_threshold
+
+        if self.adaptive:
+            self._adjust_interval()
+
+    def record_frame_time(self, elapsed):
+        """Record how long a whole frame took, counting frames over budget."""
+        self.frames_seen += 1
+        if elapsed > self.frame_budget:
+            self.budget_misses += 1
+
+    def _adjust_interval(self):
+        inference_budget = self.frame_budget * self.budget_fraction
+        cost_interval = math.ceil(self.avg_inference_time / inference_budget) if inference_budget > 0 else self.max_interval
+        desired = cost_interval if self.avg_motion >= self.motion_threshold else cost_interval + 1
+        desired = max(self.min_interval, min(self.max_interval, desired))
+
+        # Move one step at a time so a single slow run does not cause a jump in cadence
+        if desired > self.interval:
+            self.interval += 1
+        elif desired < self.interval:
+            self.interval -= 1
+
+    def get_stats(self):
+        return {
+            'interval': self.interval,
+            'adaptive': self.adaptive,
+            'avg_inference_ms': (self.avg_inference_time or 0.0) * 1000,
+            'avg_motion': self.avg_motion,
+            'budget_misses': self.budget_misses,
+            'frames_seen': self.frames_seen
+        }
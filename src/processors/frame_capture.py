@@ -0,0 +1,117 @@
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+class CapturedFrame(NamedTuple):
+    """A frame handed out by FrameCapture together with its capture metadata."""
+    frame: np.ndarray
+    seq: int          # Monotonic sequence number, starts at 1
+    timestamp: float  # time.perf_counter() when the frame was read from the device
+
+
+class FrameCapture:
+    """Reads frames from a cv2.VideoCapture-like object on a dedicated thread.
+
+    Only the newest frame is kept (a single latest-frame slot), so the game loop
+    never waits on the camera driver. Frames that are overwritten before anyone
+    read them are counted in `dropped_frames`.
+    With threaded=False the capture is read synchronously on the caller's thread.
+    """
+
+    def __init__(self, cap, threaded=True):
+        self.cap = cap
+        self.threaded = threaded
+
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._failed = False
+
+        self._latest = None  # CapturedFrame or None
+        self._last_read_seq = 0
+        self._seq = 0
+
+        self.frames_captured = 0
+        self.dropped_frames = 0
+
+    def start(self):
+        """Start the capture thread (no-op in synchronous mode)."""
+        if not self.threaded or self._running:
+            return self
+        self._running = True
+        self._failed = False
+        self._thread = threading.Thread(target=self._capture_loop, name="FrameCapture", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """Stop the capture thread. The underlying capture is not released."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._cond:
+            self._cond.notify_all()
+
+    @property
+    def failed(self):
+        """True once the device stopped delivering frames."""
+        return self._failed
+
+    def _publish(self, frame, timestamp):
+        """Store a new frame in the latest-frame slot. Caller holds the lock."""
+        if self._latest is not None and self._latest.seq != self._last_read_seq:
+            self.dropped_frames += 1
+        self._seq += 1
+        self.frames_captured += 1
+        self._latest = CapturedFrame(frame, self._seq, timestamp)
+        self._cond.notify_all()
+
+    def _capture_loop(self):
+        while self._running:
+            ret, frame = self.cap.read()
+            timestamp = time.perf_counter()
+            with self._cond:
+                if not ret or frame is None:
+                    self._failed = True
+                    self._running = False
+                    self._cond.notify_all()
+                    break
+                self._publish(frame, timestamp)
+
+    def read(self, timeout=1.0) -> Optional[CapturedFrame]:
+        """Return the newest captured frame.
+
+        In threaded mode this only blocks until the very first frame arrives
+        (bounded by `timeout`); afterwards it returns immediately, possibly with
+        the same frame as the previous call (compare `seq` to detect that).
+        Returns None if no frame is available or the device failed.
+        """
+        if not self.threaded:
+            ret, frame = self.cap.read()
+            if not ret or frame is None:
+                self._failed = True
+                return None
+            with self._cond:
+                self._publish(frame, time.perf_counter())
+                self._last_read_seq = self._latest.seq
+                return self._latest
+
+        with self._cond:
+            if self._latest is None and not self._failed:
+                self._cond.wait_for(lambda: self._latest is not None or self._failed, timeout)
+            if self._failed or self._latest is None:
+                return None
+            self._last_read_seq = self._latest.seq
+            return self._latest
+
+    def get_stats(self):
+        """Return capture counters for the stats overlay."""
+        return {
+            'frames_captured': self.frames_captured,
+            'dropped_frames': self.dropped_frames,
+            'last_seq': self._seq
+        }
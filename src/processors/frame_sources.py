@@ -0,0 +1,141 @@
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+class FrameSource(ABC):
+    """A source of BGR frames with the subset of the cv2.VideoCapture API we use.
+
+    Anything with read() -> (ret, frame), isOpened() and release() can feed
+    FrameCapture and VideoProcessor, so recorded input can stand in for a
+    live camera. With realtime=True, read() waits until each frame is due at
+    the source's frame rate, as a camera would; otherwise frames are returned
+    as fast as they can be decoded (for benchmarks).
+    """
+
+    name = 'source'
+    DEFAULT_FPS = 30
+    realtime = False
+    _next_frame_time = None
+
+    @abstractmethod
+    def read(self):
+        """Return (ret, frame) like cv2.VideoCapture.read(); ret is False when the source is exhausted."""
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        pass
+
+    def get_fps(self):
+        """Native frame rate of the source, or 0 if unknown."""
+        return 0
+
+    def get_frame_size(self):
+        """(width, height) of the frames, or (0, 0) if unknown."""
+        return 0, 0
+
+    def _wait_for_next_frame(self):
+        """In realtime mode, sleep until the next frame is due at get_fps()."""
+        if not self.realtime:
+            return
+        interval = 1.0 / (self.get_fps() or self.DEFAULT_FPS)
+        now = time.perf_counter()
+        if self._next_frame_time is None or now - self._next_frame_time > interval:
+            # First frame, or the reader fell more than a frame behind: restart the
+            # schedule instead of delivering the missed frames in a burst
+            self._next_frame_time = now
+        elif self._next_frame_time > now:
+            time.sleep(self._next_frame_time - now)
+        self._next_frame_time += interval
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file with OpenCV."""
+
+    def __init__(self, path, loop=False, realtime=False):
+        self.path = str(path)
+        self.name = Path(path).name
+        self.loop = loop
+        self.realtime = realtime
+        self.cap = cv2.VideoCapture(self.path)
+
+    def read(self):
+        self._wait_for_next_frame()
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+    def get_fps(self):
+        return self.cap.get(cv2.CAP_PROP_FPS)
+
+    def get_frame_size(self):
+        return int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+
+class NumpyFrameSource(FrameSource):
+    """Frames from a raw (N, H, W, 3) uint8 BGR stack stored as .npy or .npz.
+
+    .npy files are memory-mapped so long recordings do not have to fit in RAM.
+    For .npz the array named `frames` is used, or the first array otherwise.
+    """
+
+    def __init__(self, path, loop=False, fps=30, realtime=False):
+        self.path = Path(path)
+        self.name = self.path.name
+        self.loop = loop
+        self.realtime = realtime
+        self.fps = fps
+        self.index = 0
+
+        if self.path.suffix == '.npz':
+            archive = np.load(self.path)
+            key = 'frames' if 'frames' in archive.files else archive.files[0]
+            self.frames = archive[key]
+            if 'fps' in archive.files:
+                self.fps = float(archive['fps'])
+        else:
+            self.frames = np.load(self.path, mmap_mode='r')
+
+        if self.frames.ndim != 4 or self.frames.shape[-1] != 3:
+            raise ValueError(f"Expected an (N, H, W, 3) frame stack in {self.path}, got shape {self.frames.shape}")
+
+    def read(self):
+        if self.index >= len(self.frames):
+            if not self.loop or len(self.frames) == 0:
+                return False, None
+            self.index = 0
+        self._wait_for_next_frame()
+        # Copy out of the (possibly memory-mapped) stack so consumers may draw on the frame
+        frame = np.array(self.frames[self.index], dtype=np.uint8)
+        self.index += 1
+        return True, frame
+
+    def isOpened(self):
+        return len(self.frames) > 0
+
+    def get_fps(self):
+        return self.fps
+
+    def get_frame_size(self):
+        return self.frames.shape[2], self.frames.shape[1]
+
+
+def open_frame_source(path, loop=False, realtime=False):
+    """Open a recorded frame source, picking the implementation from the file extension."""
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.npy', '.npz'):
+        return NumpyFrameSource(path, loop=loop, realtime=realtime)
+    return VideoFileSource(path, loop=loop, realtime=realtime)
@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import Any, NamedTuple, Optional, Tuple
+
+
+class NoseResult(NamedTuple):
+    """Outcome of one face inference run, stamped with the frame it came from."""
+    nose_point: Optional[Tuple[int, int]]
+    face_count: int
+    landmarks: Any
+    frame_seq: int
+    capture_timestamp: float    # When the source frame was captured
+    completed_timestamp: float  # When inference on it finished
+    inference_time: float       # Seconds spent inside detect_fn
+    gated: bool = False         # True when detect_fn reused an earlier result instead of running inference
+
+
+class InferenceWorker:
+    """Runs face inference on a background thread, decoupled from the game tick.
+
+    Frames are handed over with submit(); only the newest pending frame is kept,
+    so a slow model never builds up a backlog. The game thread polls
+    latest_result() and never waits for inference to finish.
+    `detect_fn(frame)` must return a (nose_point, face_count, landmarks, gated)
+    tuple, where gated is True when it reused an earlier result for the frame.
+    """
+
+    def __init__(self, detect_fn):
+        self.detect_fn = detect_fn
+
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+        self._pending = None  # (frame, seq, timestamp) waiting for the worker
+        self._result = None   # Most recent NoseResult
+        self._generation = 0  # Bumped by reset(); results from an older generation are dropped
+
+        self.frames_submitted = 0
+        self.frames_processed = 0
+        self.frames_skipped = 0
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._worker_loop, name="InferenceWorker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, frame, seq, timestamp):
+        """Queue a frame for inference, replacing any frame not yet picked up."""
+        with self._cond:
+            if self._pending is not None:
+                self.frames_skipped += 1
+            self._pending = (frame, seq, timestamp)
+            self.frames_submitted += 1
+            self._cond.notify()
+
+    def latest_result(self) -> Optional[NoseResult]:
+        """Return the most recent inference result without blocking."""
+        with self._cond:
+            return self._result
+
+    def reset(self):
+        """Drop any pending frame and published result (e.g. after a camera switch).
+
+        A frame already inside detect_fn finishes, but its result is discarded.
+        """
+        with self._cond:
+            self._pending = None
+            self._result = None
+            self._generation += 1
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running)
+                if not self._running:
+                    break
+                frame, seq, timestamp = self._pending
+                self._pending = None
+                generation = self._generation
+
+            start = time.perf_counter()
+            try:
+                nose_point, face_count, landmarks, gated = self.detect_fn(frame)
+            except Exception as e:
+                print(f"Error in inference worker: {type(e).__name__}: {e}")
+                nose_point, face_count, landmarks, gated = None, 0, None, False
+            end = time.perf_counter()
+
+            with self._cond:
+                if generation != self._generation:
+                    continue  # reset() ran during inference: the frame belongs to the old sequence
+                self._result = NoseResult(nose_point, face_count, landmarks, seq, timestamp, end, end - start, gated)
+                self.frames_processed += 1
+
+    def get_stats(self):
+        """Return worker counters for the stats overlay."""
+        with self._cond:
+            return {
+                'frames_submitted': self.frames_submitted,
+                'frames_processed': self.frames_processed,
+                'frames_skipped': self.frames_skipped,
+                'inference_time': self._result.inference_time if self._result else 0.0
+            }
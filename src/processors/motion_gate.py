@@ -0,0 +1,66 @@
+import cv2
+import numpy as np
+
+
+class FrameChangeGate:
+    """Cheap change detector that lets face inference skip static frames.
+
+    Each candidate frame is reduced to a tiny grayscale thumbnail of the
+    region around the face and compared with the thumbnail taken when
+    inference last ran. If the mean absolute difference stays below
+    `threshold` (in gray levels) the cached result can be reused, but never
+    for more than `max_stale_frames` frames in a row.
+    """
+
+    def __init__(self, threshold=4.0, max_stale_frames=10, thumbnail_size=32):
+        self.threshold = threshold
+        self.max_stale_frames = max_stale_frames
+        self.thumbnail_size = thumbnail_size
+
+        self._reference = None
+        self._reference_region = None  # (x0, y0, x1, y1) the reference was taken from
+        self._stale_frames = 0
+
+        self.frames_checked = 0
+        self.frames_skipped = 0
+        self.last_difference = 0.0
+
+    def _thumbnail(self, image, region):
+        x0, y0, x1, y1 = region
+        small = cv2.resize(image[y0:y1, x0:x1], (self.thumbnail_size, self.thumbnail_size), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def is_unchanged(self, image, region):
+        """Return True if inference on `image` can be skipped.
+
+        `region` is the area inference is about to look at; when False is
+        returned the gate takes a new reference from it, assuming inference
+        runs on this frame.
+        """
+        self.frames_checked += 1
+
+        if self._reference is not None and self._stale_frames < self.max_stale_frames:
+            thumbnail = self._thumbnail(image, self._reference_region)
+            self.last_difference = float(np.mean(cv2.absdiff(thumbnail, self._reference)))
+            if self.last_difference < self.threshold:
+                self._stale_frames += 1
+                self.frames_skipped += 1
+                return True
+
+        self._reference = self._thumbnail(image, region)
+        self._reference_region = region
+        self._stale_frames = 0
+        return False
+
+    def reset(self):
+        """Drop the reference so the next frame always runs inference."""
+        self._reference = None
+        self._reference_region = None
+        self._stale_frames = 0
+
+    def get_stats(self):
+        return {
+            'frames_checked': self.frames_checked,
+            'frames_skipped': self.frames_skipped,
+            'last_difference': self.last_difference
+        }
@@ -0,0 +1,65 @@
+from typing import Optional, Tuple
+
+
+class NosePredictor:
+    """Constant-velocity (alpha-beta) model of the nose position.
+
+    Detections are fed in with the capture timestamp of the frame they came
+    from; predict() extrapolates the filtered position to any later time so the
+    game sees a continuous signal between (and after slow) detections instead
+    of a flat line followed by a step. Extrapolation is capped at
+    `max_horizon` seconds past the last detection so a lost face does not
+    drift away.
+    """
+
+    def __init__(self, alpha=0.9, beta=0.5, max_horizon=0.1):
+        self.alpha = alpha              # Weight of the measured position vs. the prediction
+        self.beta = beta                # Weight of the measured residual in the velocity update
+        self.max_horizon = max_horizon  # Seconds
+
+        self._position = None  # (x, y) normalized
+        self._velocity = (0.0, 0.0)
+        self._timestamp = None
+
+    @property
+    def has_estimate(self):
+        return self._position is not None
+
+    def update(self, point, timestamp):
+        """Fold a detected nose point, captured at `timestamp`, into the model."""
+        if self._position is None:
+            self._position = (float(point[0]), float(point[1]))
+            self._velocity = (0.0, 0.0)
+            self._timestamp = timestamp
+            return
+
+        dt = timestamp - self._timestamp
+        if dt <= 0:
+            # Same or older frame: only correct the position
+            self._position = (float(point[0]), float(point[1]))
+            return
+
+        px = self._position[0] + self._velocity[0] * dt
+        py = self._position[1] + self._velocity[1] * dt
+        rx = point[0] - px
+        ry = point[1] - py
+
+        self._position = (px + self.alpha * rx, py + self.alpha * ry)
+        self._velocity = (self._velocity[0] + self.beta * rx / dt,
+                          self._velocity[1] + self.beta * ry / dt)
+        self._timestamp = timestamp
+
+    def predict(self, timestamp) -> Optional[Tuple[float, float]]:
+        """Return the predicted nose point at `timestamp`, or None without an estimate."""
+        if self._position is None:
+            return None
+
+        dt = min(max(0.0, timestamp - self._timestamp), self.max_horizon)
+        x = self._position[0] + self._velocity[0] * dt
+        y = self._position[1] + self._velocity[1] * dt
+        return (min(1.0, max(0.0, x)), min(1.0, max(0.0, y)))
+
+    def reset(self):
+        self._position = None
+        self._velocity = (0.0, 0.0)
+        self._timestamp = None
@@ -0,0 +1,75 @@
+from typing import Optional, Tuple
+
+
+class FaceRoiTracker:
+    """Keeps a padded region of interest around the most recently detected face.
+
+    Once a face has been found, inference only needs to look at the area around
+    it. The tracker hands out that crop, maps normalized landmark coordinates
+    from the crop back to frame coordinates, and forgets the region as soon as
+    the face is lost so the next detection runs on the full frame again.
+    """
+
+    def __init__(self, padding=0.5, min_size=0.45):
+        self.padding = padding    # Extra margin around the face, as a fraction of face size
+        # Smallest crop edge as a fraction of the frame's shorter side, keeps tiny faces
+        # detectable at any inference resolution
+        self.min_size = min_size
+        self.roi: Optional[Tuple[int, int, int, int]] = None  # (x0, y0, x1, y1) in frame pixels
+
+        self.roi_hits = 0
+        self.full_frame_runs = 0
+
+    def crop(self, frame):
+        """Return (image, box) to run inference on.
+
+        box is the (x0, y0, x1, y1) region the image was cut from; with no
+        active ROI this is the full frame.
+        """
+        h, w = frame.shape[:2]
+        if self.roi is None:
+            self.full_frame_runs += 1
+            return frame, (0, 0, w, h)
+
+        x0, y0, x1, y1 = self.roi
+        self.roi_hits += 1
+        return frame[y0:y1, x0:x1], self.roi
+
+    def to_frame(self, norm_x, norm_y, box):
+        """Map a landmark normalized to `box` into frame pixel coordinates."""
+        x0, y0, x1, y1 = box
+        return x0 + norm_x * (x1 - x0), y0 + norm_y * (y1 - y0)
+
+    def update(self, face_box, box, frame_shape):
+        """Recenter the ROI on a face box (normalized to `box`) found inside `box`."""
+        left, top = self.to_frame(face_box[0], face_box[1], box)
+        right, bottom = self.to_frame(face_box[2], face_box[3], box)
+        self.set_face_box(left, top, right, bottom, frame_shape)
+
+    def set_face_box(self, left, top, right, bottom, frame_shape):
+        """Set the ROI to a padded square around a face bounding box in frame pixels."""
+        h, w = frame_shape[:2]
+        size = max(right - left, bottom - top) * (1 + 2 * self.padding)
+        size = max(size, self.min_size * min(w, h))
+        cx = (left + right) / 2
+        cy = (top + bottom) / 2
+
+        x0 = int(max(0, cx - size / 2))
+        y0 = int(max(0, cy - size / 2))
+        x1 = int(min(w, cx + size / 2))
+        y1 = int(min(h, cy + size / 2))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            self.reset()
+            return
+        self.roi = (x0, y0, x1, y1)
+
+    def reset(self):
+        """Forget the ROI; the next crop covers the full frame."""
+        self.roi = None
+
+    def get_stats(self):
+        return {
+            'roi': self.roi,
+            'roi_hits': self.roi_hits,
+            'full_frame_runs': self.full_frame_runs
+        }
@@ -0,0 +1,50 @@
+from collections import deque
+from typing import Optional, Tuple
+
+
+class TickInputQueue:
+    """Hands timestamped nose samples to fixed simulation ticks, each sample to exactly one tick.
+
+    Detections are queued with their capture timestamp as they arrive. Each
+    tick asks for its input with the real time it stands for; it consumes the
+    oldest queued sample captured by then, so every camera sample reaches the
+    player once however many ticks a rendered frame runs, and the render rate
+    does not change what the player sees. Ticks without a new sample hold the
+    last point, or extrapolate it to the tick's time when a NosePredictor is
+    given (the predictor is only fed from here, in tick order).
+    """
+
+    def __init__(self, predictor=None, max_pending=32):
+        self.predictor = predictor
+        self._pending = deque(maxlen=max_pending)  # (timestamp, nose_point), oldest first
+        self._last_point = None
+
+    def push(self, nose_point, timestamp):
+        """Queue a detected nose point captured at `timestamp`."""
+        self._pending.append((timestamp, nose_point))
+
+    def _consume(self):
+        timestamp, point = self._pending.popleft()
+        if self.predictor:
+            self.predictor.update(point, timestamp)
+        self._last_point = point
+
+    def next_input(self, tick_time) -> Optional[Tuple[float, float]]:
+        """Nose point for the tick that ends at `tick_time`, or None without any sample yet."""
+        if self._pending and self._pending[0][0] <= tick_time:
+            self._consume()
+        if self.predictor and self.predictor.has_estimate:
+            return self.predictor.predict(tick_time)
+        return self._last_point
+
+    def catch_up(self):
+        """Consume every queued sample without running ticks (e.g. while the game is not playing)."""
+        while self._pending:
+            self._consume()
+
+    def reset(self):
+        """Forget all samples, e.g. when the face source goes away or the camera changes."""
+        self._pending.clear()
+        self._last_point = None
+        if self.predictor:
+            self.predictor.reset()
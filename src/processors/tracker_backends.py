@@ -0,0 +1,247 @@
+from abc import ABC, abstractmethod
+from typing import Any, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+import mediapipe as mp
+
+
+class TrackerResult(NamedTuple):
+    """Nose position found by a tracker backend, normalized to the image it was given."""
+    nose_point: Tuple[float, float]
+    face_box: Tuple[float, float, float, float]  # (left, top, right, bottom)
+    face_count: int
+    landmarks: Any = None
+
+
+class TrackerBackend(ABC):
+    """Interface for nose trackers used by VideoProcessor.
+
+    process() receives a BGR image (the inference frame or an ROI crop of it)
+    and returns a TrackerResult or None when no face was found. `cropped` is
+    True for ROI crops, whose origin and size change from call to call, so
+    nothing tracked from earlier images may be applied to them. Backends that
+    keep state in image coordinates across frames set supports_roi = False so
+    they always receive the full inference frame.
+    """
+
+    name = 'base'
+    supports_roi = True
+
+    @abstractmethod
+    def process(self, image, cropped=False) -> Optional[TrackerResult]:
+        """Find the nose in a BGR image; None when no face was found."""
+
+    def reset(self):
+        """Forget any per-sequence state (e.g. after a camera switch)."""
+        pass
+
+    def close(self):
+        pass
+
+
+class FaceMeshBackend(TrackerBackend):
+    """Full MediaPipe Face Mesh: 468 landmarks, most accurate and most expensive.
+
+    Full frames go to a Face Mesh in video mode, which tracks landmarks from
+    one frame to the next. ROI crops move with the face, so tracking across
+    them would follow stale image positions; they go to a second, static-image
+    Face Mesh that detects afresh on every crop.
+    """
+
+    name = 'face_mesh'
+
+    def __init__(self, max_faces=1, refine_landmarks=True, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.face_mesh = mp.solutions.face_mesh.FaceMesh(
+            max_num_faces=max_faces,
+            refine_landmarks=refine_landmarks,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+        self.crop_face_mesh = mp.solutions.face_mesh.FaceMesh(
+            static_image_mode=True,
+            max_num_faces=max_faces,
+            refine_landmarks=refine_landmarks,
+            min_detection_confidence=min_detection_confidence
+        )
+
+    def process(self, image, cropped=False):
+        rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        rgb_frame.flags.writeable = False
+
+        face_mesh = self.crop_face_mesh if cropped else self.face_mesh
+        results = face_mesh.process(rgb_frame)
+        if results is None or not results.multi_face_landmarks:
+            return None
+
+        primary_face_landmarks = results.multi_face_landmarks[0]
+        try:
+            nose_landmark = primary_face_landmarks.landmark[1]
+        except (IndexError, AttributeError, TypeError) as e:
+            print(f"Error accessing primary nose landmark: {e}")
+            return None
+
+        xs = [lm.x for lm in primary_face_landmarks.landmark]
+        ys = [lm.y for lm in primary_face_landmarks.landmark]
+        return TrackerResult(
+            (nose_landmark.x, nose_landmark.y),
+            (min(xs), min(ys), max(xs), max(ys)),
+            len(results.multi_face_landmarks),
+            primary_face_landmarks
+        )
+
+    def close(self):
+        self.face_mesh.close()
+        self.crop_face_mesh.close()
+
+
+class FaceDetectionBackend(TrackerBackend):
+    """MediaPipe short-range face detection; uses its nose-tip keypoint only."""
+
+    name = 'face_detection'
+    NOSE_TIP = 2  # Index of the nose tip in the six detection keypoints
+
+    def __init__(self, min_detection_confidence=0.5, model_selection=0):
+        self.face_detection = mp.solutions.face_detection.FaceDetection(
+            model_selection=model_selection,
+            min_detection_confidence=min_detection_confidence
+        )
+
+    def process(self, image, cropped=False):
+        # Face detection keeps no state between images, so crops need no special handling
+        rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        rgb_frame.flags.writeable = False
+
+        results = self.face_detection.process(rgb_frame)
+        if results is None or not results.detections:
+            return None
+
+        location = results.detections[0].location_data
+        try:
+            nose = location.relative_keypoints[self.NOSE_TIP]
+            bbox = location.relative_bounding_box
+        except (IndexError, AttributeError) as e:
+            print(f"Error accessing face detection keypoints: {e}")
+            return None
+
+        return TrackerResult(
+            (nose.x, nose.y),
+            (bbox.xmin, bbox.ymin, bbox.xmin + bbox.width, bbox.ymin + bbox.height),
+            len(results.detections)
+        )
+
+    def close(self):
+        self.face_detection.close()
+
+
+class OpticalFlowBackend(TrackerBackend):
+    """Tracks points around the nose with Lucas-Kanade optical flow.
+
+    A seed backend (Face Mesh by default) locates the nose and a few nearby
+    landmarks every `reseed_interval` frames or whenever tracking is lost; in
+    between, only sparse optical flow on a grayscale image is run.
+    """
+
+    name = 'optical_flow'
+    supports_roi = False  # Flow state lives in full inference-frame coordinates
+    SEED_LANDMARKS = (1, 4, 5, 6, 45, 195, 197, 275)  # Nose tip, bridge and alae
+
+    def __init__(self, seed_backend, reseed_interval=30, min_tracked_fraction=0.5):
+        self.seed_backend = seed_backend
+        self.reseed_interval = reseed_interval
+        self.min_tracked_fraction = min_tracked_fraction
+        self.lk_params = dict(
+            winSize=(15, 15),
+            maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+        self.reset()
+
+    def reset(self):
+        self._prev_gray = None
+        self._points = None       # float32 array (N, 1, 2) in pixels
+        self._nose_offset = None  # Nose position relative to the median tracked point
+        self._face_size = None    # (width, height) of the face box in pixels
+        self._frames_since_seed = 0
+
+    def _seed(self, image, gray):
+        result = self.seed_backend.process(image)
+        if result is None:
+            self.reset()
+            return None
+
+        h, w = gray.shape[:2]
+        landmarks = getattr(result.landmarks, 'landmark', None)
+        if landmarks is not None:
+            points = [(landmarks[i].x * w, landmarks[i].y * h) for i in self.SEED_LANDMARKS if i < len(landmarks)]
+        else:
+            points = [(result.nose_point[0] * w, result.nose_point[1] * h)]
+
+        self._points = np.array(points, dtype=np.float32).reshape(-1, 1, 2)
+        nose = np.array([result.nose_point[0] * w, result.nose_point[1] * h], dtype=np.float32)
+        self._nose_offset = nose - np.median(self._points[:, 0, :], axis=0)
+        left, top, right, bottom = result.face_box
+        self._face_size = ((right - left) * w, (bottom - top) * h)
+        self._prev_gray = gray
+        self._frames_since_seed = 0
+        return result
+
+    def process(self, image, cropped=False):
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        if self._points is None or self._frames_since_seed >= self.reseed_interval:
+            return self._seed(image, gray)
+
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, self._points, None, **self.lk_params)
+        if new_points is None or status is None:
+            return self._seed(image, gray)
+
+        tracked = status.reshape(-1) == 1
+        if tracked.sum() < max(1, int(len(tracked) * self.min_tracked_fraction)):
+            return self._seed(image, gray)
+
+        self._points = new_points[tracked].reshape(-1, 1, 2)
+        self._prev_gray = gray
+        self._frames_since_seed += 1
+
+        h, w = gray.shape[:2]
+        nose_x, nose_y = np.median(self._points[:, 0, :], axis=0) + self._nose_offset
+        if not (0 <= nose_x < w and 0 <= nose_y < h):
+            self.reset()
+            return None
+
+        face_w, face_h = self._face_size
+        return TrackerResult(
+            (float(nose_x / w), float(nose_y / h)),
+            ((nose_x - face_w / 2) / w, (nose_y - face_h / 2) / h, (nose_x + face_w / 2) / w, (nose_y + face_h / 2) / h),
+            1
+        )
+
+    def close(self):
+        self.seed_backend.close()
+
+
+def create_tracker_backend(face_config, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    """Build the backend named by face_detection.backend in the config."""
+    backend_name = face_config.get('backend', 'face_mesh')
+
+    def face_mesh():
+        return FaceMeshBackend(
+            max_faces=face_config.get('max_faces', 1),
+            refine_landmarks=face_config.get('refine_landmarks', True),
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    if backend_name == 'face_mesh':
+        return face_mesh()
+    if backend_name == 'face_detection':
+        return FaceDetectionBackend(min_detection_confidence=min_detection_confidence)
+    if backend_name == 'optical_flow':
+        return OpticalFlowBackend(
+            face_mesh(),
+            reseed_interval=face_config.get('optical_flow_reseed_interval', 30)
+        )
+
+    print(f"Warning: Unknown tracker backend '{backend_name}', using face_mesh.")
+    return face_mesh()
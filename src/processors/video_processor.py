@@ -2,15 +2,30 @@ import cv2
 import numpy as np
 from datetime import datetime
 import time
+from pathlib import Path
 import json
+import threading
 import mediapipe as mp
 
 from src.core.engine import GameEngine
 from src.core.renderer import Renderer
+from src.core.display_backend import create_display_backend
+from src.core.timestep import FixedTimestep
 from src.utils.game_utils import GameState, LeaderboardManager
 from src.core.input_handler import InputHandler
 from src.utils.config_manager import ConfigManager
 from src.utils.asset_manager import AssetManager
+from src.processors.frame_capture import FrameCapture
+from src.processors.inference_worker import InferenceWorker
+from src.processors.roi_tracker import FaceRoiTracker
+from src.processors.detection_scheduler import DetectionScheduler
+from src.processors.nose_predictor import NosePredictor
+from src.processors.tick_input import TickInputQueue
+from src.processors.tracker_backends import create_tracker_backend
+from src.processors.motion_gate import FrameChangeGate
+from src.processors.frame_sources import open_frame_source
+from src.utils.perf_stats import StageTimer
+from src.utils.trace import TraceRecorder
 
 def _get_available_cameras(max_cameras=5):
     """Check available camera indices (now a static/module-level function or make it a method)"""
@@ -31,90 +46,164 @@ class VideoProcessor:
         detection_confidence=0.5,
         config_path='config.json',
         cap_device=0,
-        args=None
+        args=None,
+        source=None,
+        loop_source=False,
+        benchmark=False,
+        max_frames=None,
+        record_path=None
     ):
         self.host = host
         self.port = port
         self.camera_id = camera_id
         self.args = args
         self.cap = None
+        self.frame_capture = None
+        self.last_frame_seq = 0
         self.out = None
         self.stats_enabled = True
         self.fps = 0
         self.start_time = time.time()
         self.frame_count = 0
         self.debug_mode = False
+        # Recorded input (video file or .npy/.npz frame stack) instead of a live camera
+        self.source_path = source
+        self.loop_source = loop_source
+        # Benchmark mode: headless display, no frame pacing, every frame processed synchronously
+        self.benchmark = benchmark
+        self.max_frames = max_frames
+        self.stage_timer = StageTimer()
+        # Trace recording: every game is saved as <stem>_<n>.npz for deterministic replay
+        self.record_path = record_path
+        self.trace_recorder = None
+        self.traces_saved = 0
 
         self.config_manager = ConfigManager(config_path)
         self.config = self.config_manager.config
         if not self.config_manager.validate_config():
              print("Warning: Config validation failed, using validated defaults where possible.")
 
+        # One window and one event loop: the renderer draws onto the backend's surface.
+        # The window is created before the assets so they are converted to its pixel format
+        display_backend = 'headless' if self.benchmark else self.config.get('video', {}).get('display_backend', 'pygame')
+        self.display = create_display_backend(
+            display_backend,
+            self.config.get('video', {}).get('width', 1280),
+            self.config.get('video', {}).get('height', 720)
+        )
         self.asset_manager = AssetManager(self.config)
 
         self.camera_id = self.config.get('video', {}).get('camera_id', camera_id)
 
         self.game_engine = GameEngine(self.config, self.asset_manager)
-        self.renderer = Renderer(self.config, self.asset_manager)
+        # Fixed-rate simulation, decoupled from the render rate (tick_rate 0: one tick per frame)
+        tick_rate = self.config.get('game', {}).get('tick_rate', 60)
+        self.timestep = None
+        if tick_rate:
+            self.timestep = FixedTimestep(tick_rate, self.config.get('game', {}).get('max_ticks_per_frame', 5))
+        self._last_frame_start = None
+        self.renderer = Renderer(self.config, self.asset_manager, self.display.surface)
         self.leaderboard = LeaderboardManager()
         self.input_handler = InputHandler(self.game_engine, self.renderer, self.leaderboard)
 
         self.face_detection_enabled = self.config.get('face_detection', {}).get('enabled', True)
-        self.mp_face_mesh = None
-        self.face_mesh = None
+        self.tracker_backend = None
         self.mp_drawing = mp.solutions.drawing_utils
         self.drawing_spec = self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=1, circle_radius=1)
         self.current_face_count = 0
         self._current_landmarks = None
+        self.inference_worker = None
+        self.last_result_seq = 0
+        self.roi_tracker = None
+        self.change_gate = None
+        self._cached_detection = None
+        # Set by the main thread to clear the tracking state above; consumed by
+        # whichever thread runs inference, so that state is only touched there
+        self._tracking_reset = threading.Event()
+        self.inference_width = self.config.get('face_detection', {}).get('inference_width', 0)
 
         if self.face_detection_enabled:
             self._initialize_face_processing(args)
         else:
             print("Face detection disabled in config.")
 
+        if self.face_detection_enabled and self.config.get('face_detection', {}).get('change_gating', True):
+            self.change_gate = FrameChangeGate(
+                threshold=self.config.get('face_detection', {}).get('change_threshold', 4.0),
+                max_stale_frames=self.config.get('face_detection', {}).get('max_stale_frames', 10)
+            )
+
+        if self.face_detection_enabled and self.config.get('face_detection', {}).get('async_inference', True) and not self.benchmark:
+            self.inference_worker = InferenceWorker(self._detect_face).start()
+            print("Face inference running on a background worker.")
+
         self.current_camera = self.camera_id
-        self.available_cameras = _get_available_cameras()
+        self.available_cameras = [] if self.source_path else _get_available_cameras()
 
-        self.process_every_n_frames = getattr(args, 'process_every_n_frames', self.config.get('video', {}).get('process_every_n_frames', 1))
+        face_config = self.config.get('face_detection', {})
+        default_every_n = face_config.get('process_every_n_frames', self.config.get('video', {}).get('process_every_n_frames', 1))
+        self.process_every_n_frames = getattr(args, 'process_every_n_frames', default_every_n)
         if self.process_every_n_frames < 1:
             print("Warning: process_every_n_frames must be 1 or greater. Setting to 1.")
             self.process_every_n_frames = 1
-        self.frame_counter_for_detection = 0
+        self.detection_scheduler = DetectionScheduler(
+            target_fps=self.config.get('video', {}).get('target_fps', 60),
+            interval=self.process_every_n_frames,
+            adaptive=face_config.get('adaptive_cadence', False),
+            max_interval=face_config.get('max_detection_interval', 6),
+            budget_fraction=face_config.get('inference_budget_fraction', 0.5),
+            motion_threshold=face_config.get('cadence_motion_threshold', 0.5)
+        )
         self.last_known_nose_point = None
+        self.nose_predictor = None
+        if face_config.get('nose_prediction', True):
+            self.nose_predictor = NosePredictor(
+                alpha=face_config.get('prediction_alpha', 0.9),
+                beta=face_config.get('prediction_beta', 0.5),
+                max_horizon=face_config.get('prediction_max_horizon', 0.1)
+            )
+        # Detected nose points wait here for the simulation tick they belong to
+        self.tick_input = TickInputQueue(self.nose_predictor)
 
         self.target_resolution = (
             self.config.get('video', {}).get('width', 1280),
             self.config.get('video', {}).get('height', 720)
         )
+        self.threaded_capture = self.config.get('video', {}).get('threaded_capture', True) and not self.benchmark
 
-        print(f"VideoProcessor initialized. Process every {self.process_every_n_frames} frames.")
+        print(f"VideoProcessor initialized. Process every {self.process_every_n_frames} frames"
+              f"{' (adaptive)' if self.detection_scheduler.adaptive else ''}.")
         print(f"Target resolution: {self.target_resolution}")
-        if not self.available_cameras:
+        print(f"Inference width: {self.inference_width or 'capture resolution'}")
+        if self.source_path:
+            print(f"Frame source: {self.source_path}{' (looping)' if self.loop_source else ''}")
+        elif not self.available_cameras:
             print("Warning: No cameras detected by OpenCV.")
         else:
             print(f"Available cameras: {self.available_cameras}")
 
     def _initialize_face_processing(self, args):
-        """Initializes MediaPipe Face Mesh based on config and args."""
+        """Initializes the configured nose tracker backend based on config and args."""
         try:
-            self.mp_face_mesh = mp.solutions.face_mesh
-
-            min_det_conf = getattr(args, 'detection_confidence', self.config.get('face_detection', {}).get('min_detection_confidence', 0.5))
-            min_track_conf = getattr(args, 'tracking_confidence', self.config.get('face_detection', {}).get('min_tracking_confidence', 0.5))
-
-            self.face_mesh = self.mp_face_mesh.FaceMesh(
-                max_num_faces=self.config.get('face_detection', {}).get('max_faces', 1),
-                refine_landmarks=self.config.get('face_detection', {}).get('refine_landmarks', True),
-                min_detection_confidence=min_det_conf,
-                min_tracking_confidence=min_track_conf
-            )
-            print(f"MediaPipe Face Mesh initialized with det_conf={min_det_conf}, track_conf={min_track_conf}")
+            face_config = self.config.get('face_detection', {})
+            min_det_conf = getattr(args, 'detection_confidence', face_config.get('min_detection_confidence', 0.5))
+            min_track_conf = getattr(args, 'tracking_confidence', face_config.get('min_tracking_confidence', 0.5))
+
+            self.tracker_backend = create_tracker_backend(face_config, min_det_conf, min_track_conf)
+            print(f"Tracker backend '{self.tracker_backend.name}' initialized with det_conf={min_det_conf}, track_conf={min_track_conf}")
+
+            if face_config.get('roi_tracking', True) and self.tracker_backend.supports_roi:
+                self.roi_tracker = FaceRoiTracker(
+                    padding=face_config.get('roi_padding', 0.5),
+                    min_size=face_config.get('roi_min_size', 0.45)
+                )
+                print("Face ROI tracking enabled.")
         except Exception as e:
-            print(f"Warning: MediaPipe Face Mesh initialization failed: {e}")
+            print(f"Warning: Tracker backend initialization failed: {e}")
             self.face_detection_enabled = False
 
-    def draw_stats(self, frame):
-        """Draw statistics and information overlay on the frame"""
+    def draw_stats(self):
+        """Draw statistics and information overlay onto the rendered game"""
         self.frame_count += 1
         current_time = time.time()
         elapsed_time = current_time - self.start_time
@@ -123,86 +212,170 @@ class VideoProcessor:
             self.start_time = current_time
             self.frame_count = 0
 
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        y_offset = 35
-        w, h = frame.shape[1], frame.shape[0]
+        w, h = self.target_resolution
         face_count = self.current_face_count
 
         stats_lines = [
             f"FPS: {self.fps:.1f}",
             f"Res: {w}x{h}",
             f"Cam: {self.current_camera}",
+            f"Drops: {self.frame_capture.dropped_frames if self.frame_capture else 0}",
             f"Faces: {face_count}",
             f"State: {self.game_engine.game_state.value}",
             f"Score: {self.game_engine.score}",
         ]
-
-        box_h = len(stats_lines) * 25 + 10
-        # Create an overlay for the transparent rectangle
-        overlay = frame.copy()
-        # Draw the rectangle on the overlay
-        cv2.rectangle(overlay, (10, 10), (200, 10 + box_h), (0, 0, 0), -1)
-        # Blend the overlay with the original frame
-        alpha = 0.6
-        blended_frame = cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0)
-
-        for i, stat in enumerate(stats_lines):
-            # Draw text on the blended frame
-            cv2.putText(blended_frame, stat, (20, y_offset + i*25),
-                       font, 0.5, (255, 255, 255), 1)
-
-        return blended_frame
-
-    def _process_face_frame(self, frame):
-        """Process frame for face landmarks and draw nose point."""
-        self.current_face_count = 0
-        self._current_landmarks = None
-        nose_point_detected = None
-
-        if not self.face_detection_enabled or self.face_mesh is None:
-            return frame, None
-
+        if self.face_detection_enabled:
+            scheduler_stats = self.detection_scheduler.get_stats()
+            stats_lines += [
+                f"Detect: 1/{scheduler_stats['interval']}{' auto' if scheduler_stats['adaptive'] else ''}",
+                f"Infer: {scheduler_stats['avg_inference_ms']:.1f} ms",
+                f"Over budget: {scheduler_stats['budget_misses']}",
+            ]
+            if self.change_gate:
+                stats_lines.append(f"Static skips: {self.change_gate.frames_skipped}")
+        if self.timestep is not None:
+            stats_lines.append(f"Ticks: {self.timestep.tick_rate}/s")
+        if self.renderer.resolution_scaler:
+            stats_lines.append(f"Render scale: {self.renderer.resolution_scaler.scale:.3g}")
+
+        self.renderer.draw_stats_overlay(stats_lines)
+
+    def _detect_face(self, frame):
+        """Run face inference on a BGR frame.
+
+        Returns (nose_point, face_count, landmarks, gated). The nose point is normalized
+        to [0, 1] in both axes so it does not depend on capture or inference
+        resolution; landmarks stay normalized to the image inference ran on.
+        Apart from the ROI tracker, change gate and cached result, which belong
+        to whichever thread runs inference, no shared state is modified, so
+        this can run on the inference worker. Frames the change gate considers
+        static return the cached result of the last inference run with gated
+        set; no inference ran for them, so callers must not treat them as a
+        new measurement.
+        """
         if frame is None or frame.size == 0:
             print("Warning: Empty frame received in face processor")
-            return frame, None
+            return None, 0, None, False
+
+        if self._tracking_reset.is_set():
+            self._tracking_reset.clear()
+            self._reset_tracking_state()
 
         try:
-            if not frame.flags.writeable:
-                frame = frame.copy()
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb_frame.flags.writeable = False
+            inference_frame = self._prepare_inference_frame(frame)
+            h, w = inference_frame.shape[:2]
+
+            # Only consult the gate when there is a result to reuse: it counts every
+            # skip and takes its reference on the assumption that inference follows
+            if self.change_gate is not None and self._cached_detection is not None:
+                region = self.roi_tracker.roi if self.roi_tracker and self.roi_tracker.roi else (0, 0, w, h)
+                if self.change_gate.is_unchanged(inference_frame, region):
+                    return (*self._cached_detection, True)
+
+            if self.roi_tracker is None:
+                result = self._run_face_inference(inference_frame, (0, 0, w, h), inference_frame.shape)
+            else:
+                image, box = self.roi_tracker.crop(inference_frame)
+                result = self._run_face_inference(image, box, inference_frame.shape)
+                if result[0] is None and box != (0, 0, w, h):
+                    # Face lost inside the ROI: retry on the full frame right away
+                    image, box = self.roi_tracker.crop(inference_frame)
+                    result = self._run_face_inference(image, box, inference_frame.shape)
 
-            results = self.face_mesh.process(rgb_frame)
-            rgb_frame.flags.writeable = True
+            self._cached_detection = result
+            return (*result, False)
 
-            frame.flags.writeable = True
+        except cv2.error as cv_err:
+            print(f"OpenCV error during face processing: {cv_err}")
+            return None, 0, None, False
+        except Exception as e:
+            print(f"Critical error in face processing: {type(e).__name__}: {e}")
+            return None, 0, None, False
+
+    def _reset_tracking_state(self):
+        """Forget the ROI, backend tracking state and cached result. Call from the inference thread."""
+        if self.roi_tracker:
+            self.roi_tracker.reset()
+        if self.tracker_backend:
+            self.tracker_backend.reset()
+        if self.change_gate:
+            self.change_gate.reset()
+        self._cached_detection = None
+
+    def _prepare_inference_frame(self, frame):
+        """Downscale the camera frame to the configured inference width, keeping aspect ratio."""
+        h, w = frame.shape[:2]
+        if not self.inference_width or self.inference_width >= w:
+            return frame
+        inference_height = max(1, round(h * self.inference_width / w))
+        return cv2.resize(frame, (self.inference_width, inference_height), interpolation=cv2.INTER_LINEAR)
+
+    def _run_face_inference(self, image, box, frame_shape):
+        """Run the tracker backend on `image`, which was cut from `box` of a frame of `frame_shape`."""
+        h, w = frame_shape[:2]
+        result = self.tracker_backend.process(image, cropped=box != (0, 0, w, h))
+
+        if result is None:
+            if self.roi_tracker:
+                self.roi_tracker.reset()
+            return None, 0, None
+
+        x0, y0, x1, y1 = box
+        nose_x = (x0 + result.nose_point[0] * (x1 - x0)) / w
+        nose_y = (y0 + result.nose_point[1] * (y1 - y0)) / h
+
+        if self.roi_tracker:
+            self.roi_tracker.update(result.face_box, box, frame_shape)
+
+        return (nose_x, nose_y), result.face_count, result.landmarks
 
-            if results is not None and results.multi_face_landmarks:
-                self.current_face_count = len(results.multi_face_landmarks)
-                primary_face_landmarks = results.multi_face_landmarks[0]
-                self._current_landmarks = primary_face_landmarks
+    def _process_face_frame(self, frame):
+        """Process frame for face landmarks (the nose marker is drawn on the preview).
 
-                h, w = frame.shape[:2]
+        Returns (frame, nose_point, gated); see _detect_face for gated.
+        """
+        self.current_face_count = 0
+        self._current_landmarks = None
 
-                try:
-                    nose_landmark = primary_face_landmarks.landmark[1]
-                    nose_x = int(nose_landmark.x * w)
-                    nose_y = int(nose_landmark.y * h)
-                    nose_point_detected = (nose_x, nose_y)
+        if not self.face_detection_enabled or self.tracker_backend is None:
+            return frame, None, False
 
-                    cv2.circle(frame, nose_point_detected, 5, (0, 255, 0), -1)
+        nose_point_detected, self.current_face_count, self._current_landmarks, gated = self._detect_face(frame)
 
-                except (IndexError, AttributeError, TypeError) as e:
-                    print(f"Error accessing primary nose landmark: {e}")
+        return frame, nose_point_detected, gated
 
-                return frame, nose_point_detected
+    def _consume_inference_result(self):
+        """Pick up the newest result from the inference worker, if any.
 
-        except cv2.error as cv_err:
-            print(f"OpenCV error during face processing: {cv_err}")
-            return frame, None
-        except Exception as e:
-            print(f"Critical error in face processing: {type(e).__name__}: {e}")
-            return frame, None
+        Returns the nose point of a result not seen before, otherwise None.
+        """
+        result = self.inference_worker.latest_result()
+        if result is None or result.frame_seq == self.last_result_seq:
+            return None
+
+        self.last_result_seq = result.frame_seq
+        self.current_face_count = result.face_count
+        self._current_landmarks = result.landmarks
+        if not result.gated:
+            # A gated result repeats an older detection; it is neither a cost sample nor a fresh position
+            self.detection_scheduler.record_inference(result.inference_time, result.nose_point, result.capture_timestamp)
+            if result.nose_point is not None:
+                self.tick_input.push(result.nose_point, result.capture_timestamp)
+        return result.nose_point
+
+    def _save_trace(self):
+        """Write the trace of the current game next to record_path and stop recording."""
+        recorder, self.trace_recorder = self.trace_recorder, None
+        if recorder is None or len(recorder) == 0:
+            return
+        self.traces_saved += 1
+        path = Path(self.record_path)
+        trace_path = path.with_name(f"{path.stem}_{self.traces_saved}{path.suffix or '.npz'}")
+        try:
+            recorder.save(trace_path, final_score=self.game_engine.score, final_state=self.game_engine.state_digest())
+            print(f"Saved trace of {len(recorder)} ticks to {trace_path}")
+        except OSError as e:
+            print(f"Error saving trace to {trace_path}: {e}")
 
     def _get_current_landmarks(self):
         """Return the most recent face landmarks detected."""
@@ -212,81 +385,147 @@ class VideoProcessor:
         """Return current face processing statistics (just count for now)."""
         return {'face_count': self.current_face_count}
 
-    def process_frame(self, frame):
+    def process_frame(self, frame, is_new_frame=True, capture_timestamp=None):
         """
-        Processes a single video frame: face detection, game update, rendering.
+        Processes a single video frame: face detection, game update, rendering
+        onto the display backend's surface (presenting is left to the caller).
+        is_new_frame is False when the capture thread has not delivered a newer
+        frame since the last call; face detection is skipped for repeated frames.
+        With async inference enabled the frame is only submitted to the worker and
+        the game is updated with the newest finished result, never waiting on it.
         """
         try:
-            current_fps = self.fps if self.fps > 0 else self.config.get('video', {}).get('target_fps', 60)
-            dt = 1.0 / current_fps
+            frame_start = time.perf_counter()
+            target_fps = self.config.get('video', {}).get('target_fps', 60)
+            current_fps = self.fps if self.fps > 0 else target_fps
+            # Real time since the previous frame; benchmarks run unpaced, so they pretend to hit the target
+            if self.benchmark or self._last_frame_start is None:
+                frame_dt = 1.0 / target_fps
+            else:
+                frame_dt = frame_start - self._last_frame_start
+            self._last_frame_start = frame_start
 
             processed_display_frame = frame
-            current_nose_point = self.last_known_nose_point
+            nose_marker = None # (normalized point, BGR color) drawn on the webcam preview
 
             if frame is not None and frame.size > 0 and self.face_detection_enabled:
-                self.frame_counter_for_detection += 1
-                if self.frame_counter_for_detection >= self.process_every_n_frames:
-                    self.frame_counter_for_detection = 0
+                run_detection = is_new_frame and self.detection_scheduler.should_run()
 
+                if self.inference_worker is not None:
+                    # Hand the frame to the worker and use whatever result is ready now
+                    if run_detection:
+                        self.inference_worker.submit(frame, self.last_frame_seq, capture_timestamp or time.perf_counter())
+
+                    nose_point_detected = self._consume_inference_result()
+                    marker_color = (0, 255, 0) if nose_point_detected is not None else (255, 0, 0)
+                    if nose_point_detected is not None:
+                        self.last_known_nose_point = nose_point_detected
+
+                    if self.last_known_nose_point:
+                        nose_marker = (self.last_known_nose_point, marker_color)
+
+                elif run_detection:
                     # Process face and handle return value robustly
+                    detection_start = time.perf_counter()
                     face_result = self._process_face_frame(frame)
-                    if isinstance(face_result, tuple) and len(face_result) == 2:
-                        processed_face_frame, nose_point_detected = face_result
+                    detection_end = time.perf_counter()
+                    if isinstance(face_result, tuple) and len(face_result) == 3:
+                        processed_face_frame, nose_point_detected, gated = face_result
                     else:
                         # Fallback if return value is unexpected
                         print(f"Warning: Unexpected return from _process_face_frame: {face_result}")
                         processed_face_frame = frame 
                         nose_point_detected = None 
+                        gated = False
 
                     # Use the processed frame for display
                     processed_display_frame = processed_face_frame
                     
-                    # Update current nose point if detected
+                    self.stage_timer.add('face', detection_end - detection_start)
+                    if not gated:
+                        self.detection_scheduler.record_inference(
+                            detection_end - detection_start, nose_point_detected, capture_timestamp or detection_end)
+
+                    # Queue a new nose point for the game; if not detected, the ticks hold the last one
                     if nose_point_detected is not None:
-                        current_nose_point = nose_point_detected
                         self.last_known_nose_point = nose_point_detected
-                    # If not detected, current_nose_point retains its value (last_known_nose_point)
+                        nose_marker = (nose_point_detected, (0, 255, 0))
+                        if not gated:
+                            self.tick_input.push(nose_point_detected, capture_timestamp or detection_end)
 
                 else:
                     # Use last known point if skipping detection frame
                     processed_display_frame = frame # Start with the current camera frame
-                    if self.last_known_nose_point and processed_display_frame is not None:
-                         # Draw the last known point (make frame writable if needed)
-                         if not processed_display_frame.flags.writeable:
-                             processed_display_frame = processed_display_frame.copy()
-                         cv2.circle(processed_display_frame, self.last_known_nose_point, 5, (255, 0, 0), -1) # Draw red circle for last known
+                    if self.last_known_nose_point:
+                         nose_marker = (self.last_known_nose_point, (255, 0, 0)) # Blue marker for last known
             else:
                  # Handle case where frame is None or face detection disabled
                  processed_display_frame = frame if frame is not None else np.zeros((self.target_resolution[1], self.target_resolution[0], 3), dtype=np.uint8)
-                 current_nose_point = None # No face detection, no nose point
-                 self.last_known_nose_point = None
+                 self.last_known_nose_point = None # No face detection, no nose point
+                 self.tick_input.reset()
 
             if self.game_engine.game_state == GameState.PLAYING:
-                # Pass the determined current_nose_point (could be new, last known, or None)
-                self.game_engine.update(dt, current_nose_point)
+                if self.timestep is not None:
+                    ticks, dt = self.timestep.advance(frame_dt), self.timestep.dt
+                else:
+                    ticks, dt = 1, 1.0 / current_fps
+
+                # Real time each tick stands for: the last one ends where the unspent remainder starts
+                alpha = self.timestep.alpha if self.timestep is not None else 0.0
+                stage_start = time.perf_counter()
+                for i in range(ticks):
+                    # Each tick gets its own input: a new sample captured by its time, else the
+                    # last one held (or extrapolated), so frames running several ticks feed the
+                    # player the same sequence as frames running one
+                    tick_time = frame_start - (ticks - 1 - i + alpha) * dt
+                    nose_point = self.tick_input.next_input(tick_time)
+                    if self.record_path and self.trace_recorder is None and self.game_engine.tick_count == 0:
+                        self.trace_recorder = TraceRecorder(self.game_engine.seed)
+                    if self.trace_recorder is not None:
+                        self.trace_recorder.record(dt, nose_point)
+
+                    self.game_engine.update(dt, nose_point)
+
+                    if self.game_engine.game_state != GameState.PLAYING:
+                        if self.trace_recorder is not None:
+                            self._save_trace()
+                        break
+                self.stage_timer.add('engine', time.perf_counter() - stage_start)
+            else:
+                self.tick_input.catch_up()  # Don't replay menu-time samples once a game starts
+                if self.timestep is not None:
+                    self.timestep.reset()  # Show the final/initial state as is, don't bank menu time
 
             game_state_dict = self.game_engine.get_game_state()
+            # How far between the last two ticks this frame is drawn, and the real time it covers
+            game_state_dict['interpolation'] = self.timestep.alpha if self.timestep is not None else 1.0
+            game_state_dict['frame_dt'] = frame_dt
 
-            game_surface_cv2 = self.renderer.render(processed_display_frame, game_state_dict)
+            stage_start = time.perf_counter()
+            game_surface = self.renderer.render(processed_display_frame, game_state_dict, nose_marker)
+            self.stage_timer.add('render', time.perf_counter() - stage_start)
+
+            frame_time = time.perf_counter() - frame_start
+            self.detection_scheduler.record_frame_time(frame_time)
+            self.renderer.record_frame_time(frame_time)
 
             if self.stats_enabled:
-                 final_frame = self.draw_stats(game_surface_cv2)
-            else:
-                 final_frame = game_surface_cv2
+                 stage_start = time.perf_counter()
+                 self.draw_stats()
+                 self.stage_timer.add('stats', time.perf_counter() - stage_start)
 
-            return final_frame
+            return game_surface
 
         except Exception as e:
             print(f"Error processing frame: {e}")
-            if frame is not None:
-                 return frame
-            else:
-                 h = self.config.get('video', {}).get('height', 720)
-                 w = self.config.get('video', {}).get('width', 1280)
-                 return np.zeros((h, w, 3), dtype=np.uint8)
+            self.renderer.request_full_redraw()  # The frame may be half drawn
+            return None
 
     def _setup_camera(self):
         """Initializes or re-initializes the camera capture."""
+        if self.frame_capture:
+            self.frame_capture.stop()
+            self.frame_capture = None
         if self.cap:
             self.cap.release()
 
@@ -330,21 +569,74 @@ class VideoProcessor:
 
         self.target_resolution = (actual_w, actual_h)
 
+        if self.inference_worker:
+            # Sequence numbers restart with the new capture, so forget old results
+            self.inference_worker.reset()
+            self.last_result_seq = 0
+        # The inference worker may be mid-detection; let it reset its own state
+        self._tracking_reset.set()
+        # Frame times measured with the old camera no longer apply
+        self.renderer.reset_dynamic_resolution()
+        self.tick_input.reset()
+
+        self.frame_capture = FrameCapture(self.cap, threaded=self.threaded_capture).start()
+        self.last_frame_seq = 0
+        print(f"Frame capture started ({'threaded' if self.threaded_capture else 'synchronous'}).")
+
+        return True
+
+    def _setup_source(self):
+        """Opens the recorded frame source given instead of a camera."""
+        if self.frame_capture:
+            self.frame_capture.stop()
+            self.frame_capture = None
+        if self.cap:
+            self.cap.release()
+
+        try:
+            # Deliver frames at the source's own rate like a camera; benchmarks take them as fast as possible
+            self.cap = open_frame_source(self.source_path, loop=self.loop_source, realtime=not self.benchmark)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not open frame source {self.source_path}: {e}")
+            return False
+        if not self.cap.isOpened():
+            print(f"Error: Could not open frame source {self.source_path}.")
+            return False
+
+        width, height = self.cap.get_frame_size()
+        if width and height:
+            self.target_resolution = (width, height)
+        print(f"Frame source {self.cap.name}: {width}x{height} @ {self.cap.get_fps():.2f} FPS")
+        self.renderer.reset_dynamic_resolution()
+
+        self.frame_capture = FrameCapture(self.cap, threaded=self.threaded_capture).start()
+        self.last_frame_seq = 0
         return True
 
     def run(self):
         """Main loop to capture, process, and display video frames."""
-        if not self._setup_camera():
+        setup = self._setup_source if self.source_path else self._setup_camera
+        if not setup():
              print("Exiting due to camera initialization failure.")
              return
 
         frame_delay = 1 / self.config.get('video', {}).get('target_fps', 60)
+        frames_processed = 0
+        if self.benchmark:
+            # Keep the engine busy for the whole run
+            self.game_engine.game_state = GameState.PLAYING
+            self.stage_timer.reset()
 
         while True:
             loop_start_time = time.time()
 
-            ret, frame = self.cap.read()
-            if not ret or frame is None:
+            stage_start = time.perf_counter()
+            captured = self.frame_capture.read()
+            self.stage_timer.add('capture', time.perf_counter() - stage_start)
+            if captured is None:
+                if self.source_path:
+                    print("End of frame source.")
+                    break
                 print("Error reading frame or end of stream.")
                 time.sleep(1)
                 if not self._setup_camera():
@@ -352,12 +644,29 @@ class VideoProcessor:
                     break
                 continue
 
-            processed_frame = self.process_frame(frame)
+            is_new_frame = captured.seq != self.last_frame_seq
+            self.last_frame_seq = captured.seq
+            self.process_frame(captured.frame, is_new_frame, captured.timestamp)
+            dirty_rects = self.renderer.get_dirty_rects()
+            frames_processed += 1
+
+            if self.benchmark:
+                if self.game_engine.game_state == GameState.GAME_OVER:
+                    self.game_engine.reset()
+                    self.renderer.reset_dynamic_resolution()
+                    self.game_engine.game_state = GameState.PLAYING
+                if self.max_frames and frames_processed >= self.max_frames:
+                    break
+                continue
 
-            cv2.imshow('Head Jump Game', processed_frame)
+            stage_start = time.perf_counter()
+            self.display.present(dirty_rects)
+            keys = self.display.poll_keys()
+            self.stage_timer.add('present', time.perf_counter() - stage_start)
+            if not all(self.input_handler.handle_input(key) for key in keys):
+                break
 
-            key = cv2.waitKey(1)
-            if not self.input_handler.handle_input(key):
+            if self.max_frames and frames_processed >= self.max_frames:
                 break
 
             loop_end_time = time.time()
@@ -366,17 +675,32 @@ class VideoProcessor:
             if wait_time > 0:
                 time.sleep(wait_time)
 
+        if self.benchmark:
+            print("Benchmark results:")
+            print(self.stage_timer.report(frames_processed))
+
         self.release()
 
     def release(self):
         """Release resources."""
+        if self.trace_recorder is not None:
+            self._save_trace() # Keep the unfinished game as well
+        if self.inference_worker:
+            self.inference_worker.stop()
+            self.inference_worker = None
+        if self.tracker_backend:
+            self.tracker_backend.close()
+            self.tracker_backend = None
+        if self.frame_capture:
+            self.frame_capture.stop()
+            self.frame_capture = None
         if self.cap:
             self.cap.release()
             print("Camera released.")
         if self.out:
             self.out.release()
             print("Video writer released.")
-        cv2.destroyAllWindows()
+        self.display.close()
         print("Windows destroyed.")
 
     def _change_camera(self, direction=1):
@@ -0,0 +1,52 @@
+import pygame
+from typing import List, Optional
+
+
+class Animation:
+    """A fixed list of pre-rendered frames played at `fps`.
+
+    Frames are picked from a time value (seconds of simulation time), so the
+    same game state always shows the same frame, and nothing is created or
+    scaled while drawing.
+    """
+
+    def __init__(self, frames: List[pygame.Surface], fps: float = 10.0, loop: bool = True):
+        if not frames:
+            raise ValueError("An animation needs at least one frame")
+        self.frames = frames
+        self.fps = fps
+        self.loop = loop
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame_index(self, t: float) -> int:
+        if len(self.frames) == 1 or self.fps <= 0:
+            return 0
+        index = int(t * self.fps)
+        if self.loop:
+            return index % len(self.frames)
+        return min(max(index, 0), len(self.frames) - 1)
+
+    def frame_at(self, t: float) -> pygame.Surface:
+        return self.frames[self.frame_index(t)]
+
+
+def slice_sprite_sheet(sheet: pygame.Surface, frame_width: int, frame_height: int,
+                       row: int = 0, count: Optional[int] = None,
+                       size: Optional[tuple] = None) -> List[pygame.Surface]:
+    """Cut one row of a sprite sheet into separate frame surfaces.
+
+    `count` defaults to as many frames as fit in the row. With `size` the
+    frames are scaled once here, so drawing never has to.
+    """
+    if count is None:
+        count = sheet.get_width() // frame_width
+    frames = []
+    for i in range(count):
+        rect = pygame.Rect(i * frame_width, row * frame_height, frame_width, frame_height)
+        frame = sheet.subsurface(rect).copy()
+        if size is not None and frame.get_size() != tuple(size):
+            frame = pygame.transform.smoothscale(frame, size)
+        frames.append(frame)
+    return frames
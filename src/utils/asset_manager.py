@@ -1,37 +1,163 @@
+import hashlib
+import json
+import os
 import pygame
 import math
+import weakref
+from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
+from src.utils.animation import Animation, slice_sprite_sheet
+
+# Bump whenever the drawing code changes, so stale disk caches are regenerated
+ASSET_CACHE_VERSION = 2
+# Config sections the generated assets depend on; the disk cache is keyed by their hash
+ASSET_CONFIG_SECTIONS = ('player', 'obstacles', 'powerup', 'animation')
+
 class AssetManager:
+    # Alpha of the player while invincible; its variants are pre-built with the assets
+    INVINCIBILITY_ALPHA = 128
+
+    # Procedural animation frame counts (sprite sheets bring their own)
+    PLAYER_FRAME_COUNTS = {'idle': 2, 'run': 4, 'jump': 1}
+    OBSTACLE_FRAME_COUNTS = {'flying_rock': 8}
+    POWERUP_FRAME_COUNT = 6
+
     def __init__(self, config):
         self.config = config
         self.assets = {}
+        self.obstacle_specs = {}     # obstacle type -> (width, height_min, height_max, color)
+        self.obstacle_variants = {}  # (obstacle type, height) -> Surface matching the engine's geometry
+        # Animation frames, e.g. 'player:run', 'obstacle_flying_rock:50', 'powerup_slow_motion:default'
+        self.frame_sets = {}
+        self.animations = {}         # frame set name -> Animation
+        self._alpha_variants = weakref.WeakKeyDictionary()  # Surface -> {alpha: Surface}
+
+        animation_config = config.get('animation', {})
+        self.animation_enabled = animation_config.get('enabled', True)
+        self.animation_fps = animation_config.get('fps', {})
+
+        asset_config = config.get('assets', {})
+        self.cache_path = None
+        if asset_config.get('disk_cache', False):
+            cache_dir = Path(asset_config.get('cache_dir', '.cache/assets'))
+            self.cache_path = cache_dir / f'assets_{self.config_hash()}.npz'
         self._generate_assets()
 
+    def config_hash(self):
+        """Short hash of everything the generated assets depend on."""
+        relevant = {section: self.config.get(section) for section in ASSET_CONFIG_SECTIONS}
+        relevant['version'] = ASSET_CACHE_VERSION
+        # Sprite sheets are part of the input too: a changed file must not hit the old cache
+        sheets = {}
+        for owner, sheet_config in self.config.get('animation', {}).get('sheets', {}).items():
+            try:
+                stat = os.stat(sheet_config.get('path', ''))
+                sheets[owner] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                sheets[owner] = None
+        relevant['sheets'] = sheets
+        payload = json.dumps(relevant, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()[:16]
+
     def _generate_assets(self):
-        print("Generating procedural assets...")
-        self._generate_player_asset()
-        self._generate_obstacle_assets()
-        self._generate_powerup_assets()
-        print(f"Assets generated: {list(self.assets.keys())}")
+        self._load_obstacle_specs()
+        if not (self.cache_path and self._load_cache()):
+            print("Generating procedural assets...")
+            self._generate_player_asset()
+            self._generate_obstacle_assets()
+            self._generate_powerup_assets()
+            self._apply_sprite_sheets()
+            if self.cache_path:
+                self._save_cache()
+        # Blits are fastest from the display's pixel format, which only exists once the window does
+        if pygame.display.get_surface() is not None:
+            self.convert_for_display()
+        self._link_frame_sets()
+        # Invincibility can start on any player frame; build all its variants up front
+        self.get_alpha_variant(self.assets['player'], self.INVINCIBILITY_ALPHA)
+        for name, frames in self.frame_sets.items():
+            if name.startswith('player:'):
+                for frame in frames:
+                    self.get_alpha_variant(frame, self.INVINCIBILITY_ALPHA)
+        print(f"Assets generated: {list(self.assets.keys())} + {len(self.obstacle_variants)} obstacle sizes, "
+              f"{sum(len(frames) for frames in self.frame_sets.values())} animation frames")
+
+    def convert_for_display(self):
+        """Convert every surface to the display's pixel format (call after the window exists)."""
+        self.assets = {name: surface.convert_alpha() for name, surface in self.assets.items()}
+        self.frame_sets = {name: [frame.convert_alpha() for frame in frames] for name, frames in self.frame_sets.items()}
+        self._link_frame_sets()
+        self._alpha_variants.clear()
+
+    def _link_frame_sets(self):
+        """Rebuild the obstacle variants and Animation objects from the frame sets."""
+        self.obstacle_variants = {}
+        self.animations = {}
+        for name, frames in self.frame_sets.items():
+            owner, _, state = name.partition(':')
+            if owner.startswith('obstacle_'):
+                # Frame 0 is the still image for this size
+                self.obstacle_variants[(owner[len('obstacle_'):], int(state))] = frames[0]
+                fps = self.animation_fps.get('obstacle', 8)
+            elif owner.startswith('powerup_'):
+                fps = self.animation_fps.get('powerup', 6)
+            else:
+                fps = self.animation_fps.get(state, 8)
+            self.animations[name] = Animation(frames, fps)
+        for name, (_, h_min, h_max, _) in self.obstacle_specs.items():
+            # The average height stays available as the type's default asset
+            self.assets[f'obstacle_{name}'] = self.obstacle_variants.get((name, (h_min + h_max) // 2))
+
+    def _frame_count(self, count):
+        return count if self.animation_enabled else 1
 
     def _generate_player_asset(self):
         player_config = self.config.get('player', {})
         size = player_config.get('size', 50)
         color = tuple(player_config.get('color', (0, 200, 0))) # Default bright green
 
+        self.assets['player'] = self._draw_player(size, color)
+
+        # Animation frames: idle blinks, run bobs (squash and stretch), jump stretches
+        poses = {
+            'idle': [(0.0, False), (0.0, True)],
+            'run': [(0.0, False), (0.08, False), (0.0, False), (-0.08, False)],
+            'jump': [(-0.12, False)]
+        }
+        for state, state_poses in poses.items():
+            count = self._frame_count(self.PLAYER_FRAME_COUNTS[state])
+            self.frame_sets[f'player:{state}'] = [
+                self._draw_player(size, color, squash, blink) for squash, blink in state_poses[:count]
+            ]
+
+    def _draw_player(self, size, color, squash=0.0, blink=False):
         # Create a surface with per-pixel alpha
         surface = pygame.Surface((size, size), pygame.SRCALPHA)
-        # Draw a simple circle character
-        pygame.draw.circle(surface, color, (size // 2, size // 2), size // 2)
+        if squash == 0.0:
+            # Draw a simple circle character
+            pygame.draw.circle(surface, color, (size // 2, size // 2), size // 2)
+            top, body_h = 0, size
+        else:
+            # Squashed (wider than tall) or stretched body, standing on the bottom edge
+            body_w = size if squash > 0 else round(size * (1 + squash))
+            body_h = round(size * (1 - squash)) if squash > 0 else size
+            top = size - body_h
+            pygame.draw.ellipse(surface, color, ((size - body_w) // 2, top, body_w, body_h))
         # Add a simple 'eye'
         eye_size = size // 6
-        pygame.draw.circle(surface, (255, 255, 255), (size * 2 // 3, size // 3), eye_size)
-        pygame.draw.circle(surface, (0, 0, 0), (size * 2 // 3 + eye_size // 3, size // 3), eye_size // 2)
-        
-        self.assets['player'] = surface
+        eye_center = (size * 2 // 3, top + body_h // 3)
+        if blink:
+            pygame.draw.line(surface, (0, 0, 0), (eye_center[0] - eye_size, eye_center[1]),
+                             (eye_center[0] + eye_size, eye_center[1]), 2)
+        else:
+            pygame.draw.circle(surface, (255, 255, 255), eye_center, eye_size)
+            pygame.draw.circle(surface, (0, 0, 0), (eye_center[0] + eye_size // 3, eye_center[1]), eye_size // 2)
+        return surface
 
-    def _generate_obstacle_assets(self):
+    def _load_obstacle_specs(self):
         obstacle_configs = self.config.get('obstacles', {})
         base_config = obstacle_configs.get('base', {})
 
@@ -41,34 +167,56 @@ class AssetManager:
 
             # Use specific config, fall back to base, then to defaults
             width = config.get('width', base_config.get('width', 50))
-            # Use average of min/max height for procedural generation for now
             h_min = config.get('height_min', base_config.get('height_min', 50))
             h_max = config.get('height_max', base_config.get('height_max', 100))
-            height = (h_min + h_max) // 2 
             color = tuple(config.get('color', base_config.get('color', (255, 0, 0))))
+            self.obstacle_specs[name] = (width, h_min, h_max, color)
 
-            surface = pygame.Surface((width, height), pygame.SRCALPHA)
-            
-            if name == 'low_cactus':
-                # Draw a simple cactus shape
-                pygame.draw.rect(surface, color, (0, 0, width, height))
-                # Add some details (lines)
-                for i in range(1, 4):
-                    pygame.draw.line(surface, (0,0,0, 50), (width * i // 4, 5), (width * i // 4, height-5), 1)
-            elif name == 'flying_rock':
-                # Draw a rough rock shape (polygon)
+    def _generate_obstacle_assets(self):
+        for name, (width, h_min, h_max, color) in self.obstacle_specs.items():
+            count = self._frame_count(self.OBSTACLE_FRAME_COUNTS.get(name, 1))
+            # One frame set per height the engine can spawn, so sprites match collision boxes
+            for height in range(h_min, h_max + 1):
+                if count == 1:
+                    frames = [self._draw_obstacle(name, width, height, color)]
+                else:
+                    frames = [self._draw_obstacle(name, width, height, color, i / count) for i in range(count)]
+                self.frame_sets[f'obstacle_{name}:{height}'] = frames
+
+    def _draw_obstacle(self, name, width, height, color, phase=None):
+        """Draw one obstacle; `phase` in [0, 1) selects a frame of its animation (None = still image)."""
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        
+        if name == 'low_cactus':
+            # Draw a simple cactus shape
+            pygame.draw.rect(surface, color, (0, 0, width, height))
+            # Add some details (lines)
+            for i in range(1, 4):
+                pygame.draw.line(surface, (0,0,0, 50), (width * i // 4, 5), (width * i // 4, height-5), 1)
+        elif name == 'flying_rock':
+            # Draw a rough rock shape (polygon)
+            if phase is None:
                 points = [
                     (0, height // 3), (width // 3, 0), (width * 2 // 3, 0), 
                     (width, height // 3), (width, height * 2 // 3), 
                     (width * 2 // 3, height), (width // 3, height), (0, height * 2 // 3)
                 ]
-                pygame.draw.polygon(surface, color, points)
-                pygame.draw.polygon(surface, (0,0,0, 50), points, 2) # Outline
             else:
-                 # Default to a rectangle
-                 pygame.draw.rect(surface, color, (0, 0, width, height))
+                # Tumbling: the octagon turns through one eighth of a turn over the loop,
+                # staying inside the obstacle's box
+                rx, ry = (width - 1) / 2, (height - 1) / 2
+                turn = (phase + 0.5) * 2 * math.pi / 8
+                points = [
+                    (rx + rx * math.cos(turn + i * math.pi / 4), ry + ry * math.sin(turn + i * math.pi / 4))
+                    for i in range(8)
+                ]
+            pygame.draw.polygon(surface, color, points)
+            pygame.draw.polygon(surface, (0,0,0, 50), points, 2) # Outline
+        else:
+             # Default to a rectangle
+             pygame.draw.rect(surface, color, (0, 0, width, height))
 
-            self.assets[f'obstacle_{name}'] = surface
+        return surface
 
     def _generate_powerup_assets(self):
         powerup_configs = self.config.get('powerup', {}).get('types', {})
@@ -77,33 +225,140 @@ class AssetManager:
 
         for name, config in powerup_configs.items():
             color = tuple(config.get('color', default_color))
-            surface = pygame.Surface((size, size), pygame.SRCALPHA)
-            center = (size // 2, size // 2)
-            radius = size // 2
-
-            if name == 'score_boost':
-                # Draw a star
-                points = []
-                for i in range(5):
-                    angle = math.pi / 2 - 2 * math.pi * i / 5
-                    points.append((center[0] + radius * math.cos(angle), center[1] - radius * math.sin(angle)))
-                    angle += math.pi / 5
-                    points.append((center[0] + radius/2 * math.cos(angle), center[1] - radius/2 * math.sin(angle)))
-                pygame.draw.polygon(surface, color, points)
-            elif name == 'invincibility':
-                # Draw a shield shape
-                pygame.draw.rect(surface, color, (2, 0, size - 4, size - 4), border_top_left_radius=4, border_top_right_radius=4)
-                pygame.draw.polygon(surface, color, [(2, size - 5), (size - 2, size - 5), center])
-            elif name == 'slow_motion':
-                 # Draw a clock face
-                 pygame.draw.circle(surface, color, center, radius, 2) # Outline
-                 pygame.draw.line(surface, color, center, (center[0], center[1] - radius * 0.7), 2) # Minute hand
-                 pygame.draw.line(surface, color, center, (center[0] + radius * 0.5, center[1]), 1) # Hour hand
-            else:
-                 # Default to circle
-                 pygame.draw.circle(surface, color, center, radius)
+            self.assets[f'powerup_{name}'] = self._draw_powerup(name, color, size)
+
+            # Pulse: the icon shrinks and grows again inside the same box
+            count = self._frame_count(self.POWERUP_FRAME_COUNT)
+            self.frame_sets[f'powerup_{name}:default'] = [
+                self._draw_powerup(name, color, size, 0.85 + 0.15 * math.cos(2 * math.pi * i / count))
+                for i in range(count)
+            ]
+
+    def _draw_powerup(self, name, color, size, scale=1.0):
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = (size // 2, size // 2)
+        radius = size // 2 * scale
+
+        if name == 'score_boost':
+            # Draw a star
+            points = []
+            for i in range(5):
+                angle = math.pi / 2 - 2 * math.pi * i / 5
+                points.append((center[0] + radius * math.cos(angle), center[1] - radius * math.sin(angle)))
+                angle += math.pi / 5
+                points.append((center[0] + radius/2 * math.cos(angle), center[1] - radius/2 * math.sin(angle)))
+            pygame.draw.polygon(surface, color, points)
+        elif name == 'invincibility':
+            # Draw a shield shape
+            inset = round(size * (1 - scale) / 2)
+            pygame.draw.rect(surface, color, (2 + inset, inset, size - 4 - 2 * inset, size - 4 - 2 * inset),
+                             border_top_left_radius=4, border_top_right_radius=4)
+            pygame.draw.polygon(surface, color, [(2 + inset, size - 5 - inset), (size - 2 - inset, size - 5 - inset), center])
+        elif name == 'slow_motion':
+             # Draw a clock face
+             pygame.draw.circle(surface, color, center, radius, 2) # Outline
+             pygame.draw.line(surface, color, center, (center[0], center[1] - radius * 0.7), 2) # Minute hand
+             pygame.draw.line(surface, color, center, (center[0] + radius * 0.5, center[1]), 1) # Hour hand
+        else:
+             # Default to circle
+             pygame.draw.circle(surface, color, center, radius)
+
+        return surface
+
+    def _apply_sprite_sheets(self):
+        """Replace procedural frames with frames sliced from configured sprite sheets.
+
+        animation.sheets maps an owner ('player', 'obstacle_<type>', 'powerup_<type>') to
+        {path, frame_width, frame_height, states: {state: {row, count}}}. Frames are scaled
+        once to the size of the procedural frames they replace.
+        """
+        for owner, sheet_config in self.config.get('animation', {}).get('sheets', {}).items():
+            try:
+                sheet = pygame.image.load(sheet_config['path'])
+            except (KeyError, pygame.error, OSError) as e:
+                print(f"Warning: Could not load sprite sheet for '{owner}': {e}")
+                continue
+
+            frame_w = sheet_config.get('frame_width', sheet.get_height())
+            frame_h = sheet_config.get('frame_height', sheet.get_height())
+            for state, state_config in sheet_config.get('states', {'default': {}}).items():
+                # Obstacles have one frame set per height; everything else one per state
+                if owner.startswith('obstacle_'):
+                    targets = [name for name in self.frame_sets if name.startswith(f'{owner}:')]
+                else:
+                    targets = [f'{owner}:{state}']
+                for target in targets:
+                    existing = self.frame_sets.get(target)
+                    size = existing[0].get_size() if existing else None
+                    self.frame_sets[target] = slice_sprite_sheet(
+                        sheet, frame_w, frame_h, state_config.get('row', 0), state_config.get('count'), size
+                    )
+
+    def _save_cache(self):
+        """Write all generated surfaces to the cache file as one packed RGBA blob plus an index."""
+        entries = [(f'asset:{name}', surface) for name, surface in self.assets.items()
+                   if not name.startswith('obstacle_')]  # Obstacle defaults are linked from the frame sets
+        for name, frames in self.frame_sets.items():
+            entries += [(f'frames:{name}:{i}', frame) for i, frame in enumerate(frames)]
 
-            self.assets[f'powerup_{name}'] = surface
+        chunks = []
+        index = np.zeros((len(entries), 3), dtype=np.int64)  # offset, width, height
+        offset = 0
+        for i, (_, surface) in enumerate(entries):
+            data = pygame.image.tobytes(surface, 'RGBA')
+            index[i] = (offset, surface.get_width(), surface.get_height())
+            chunks.append(data)
+            offset += len(data)
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so an interrupted save never leaves a broken cache
+            tmp_path = self.cache_path.with_suffix('.tmp.npz')
+            np.savez(
+                tmp_path,
+                version=ASSET_CACHE_VERSION,
+                names=np.array([name for name, _ in entries]),
+                index=index,
+                pixels=np.frombuffer(b''.join(chunks), dtype=np.uint8)
+            )
+            os.replace(tmp_path, self.cache_path)
+            print(f"Asset cache written: {self.cache_path}")
+        except OSError as e:
+            print(f"Warning: Could not write asset cache {self.cache_path}: {e}")
+
+    def _load_cache(self):
+        """Load surfaces from the cache file; returns False if there is no usable cache."""
+        if not self.cache_path.exists():
+            return False
+        assets = {}
+        frame_sets = {}
+        try:
+            with np.load(self.cache_path) as data:
+                if int(data['version']) != ASSET_CACHE_VERSION:
+                    return False
+                names = data['names'].tolist()
+                index = data['index'].tolist()
+                pixels = data['pixels'].tobytes()
+
+            for name, (offset, width, height) in zip(names, index):
+                surface = pygame.image.frombytes(pixels[offset:offset + width * height * 4], (width, height), 'RGBA')
+                kind, _, key = name.partition(':')
+                if kind == 'asset':
+                    assets[key] = surface
+                elif kind == 'frames':
+                    # Entries were written in frame order
+                    frame_set, _, _ = key.rpartition(':')
+                    frame_sets.setdefault(frame_set, []).append(surface)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable asset cache {self.cache_path}: {e}")
+            return False
+
+        if 'player' not in assets:
+            return False
+        self.assets = assets
+        self.frame_sets = frame_sets
+        print(f"Assets loaded from cache: {self.cache_path}")
+        return True
 
     def get_asset(self, name: str) -> Optional[pygame.Surface]:
         asset = self.assets.get(name)
@@ -111,8 +366,58 @@ class AssetManager:
             print(f"Warning: Asset '{name}' not found.")
         return asset
 
-    def get_obstacle_asset(self, obstacle_type: str) -> Optional[pygame.Surface]:
-        return self.get_asset(f'obstacle_{obstacle_type}')
+    def get_obstacle_asset(self, obstacle_type: str, height: Optional[int] = None) -> Optional[pygame.Surface]:
+        """The obstacle sprite, sized for `height` if given (built on demand outside the configured range)."""
+        if height is None:
+            return self.get_asset(f'obstacle_{obstacle_type}')
+        key = (obstacle_type, int(height))
+        surface = self.obstacle_variants.get(key)
+        if surface is None:
+            spec = self.obstacle_specs.get(obstacle_type)
+            if spec is None:
+                return self.get_asset(f'obstacle_{obstacle_type}')
+            width, _, _, color = spec
+            surface = self._draw_obstacle(obstacle_type, width, key[1], color)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self.obstacle_variants[key] = surface
+        return surface
+
+    def get_alpha_variant(self, surface: pygame.Surface, alpha: int) -> pygame.Surface:
+        """A cached copy of `surface` with its per-pixel alpha scaled by alpha/255.
+
+        Blitting a baked copy is much cheaper than set_alpha() on a per-pixel alpha
+        surface, and leaves the original untouched.
+        """
+        variants = self._alpha_variants.setdefault(surface, {})
+        variant = variants.get(alpha)
+        if variant is None:
+            if surface.get_flags() & pygame.SRCALPHA:
+                variant = surface.copy()
+            else:
+                variant = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+                variant.blit(surface, (0, 0))
+            variant.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            variants[alpha] = variant
+        return variant
+
+    def get_animation(self, name: str) -> Optional[Animation]:
+        """The Animation of a frame set, e.g. 'player:run', or None."""
+        return self.animations.get(name)
+
+    def get_obstacle_frame(self, obstacle_type: str, height: int, t: float) -> Optional[pygame.Surface]:
+        """The frame of the obstacle animation for its height at simulation time `t`."""
+        animation = self.animations.get(f'obstacle_{obstacle_type}:{int(height)}')
+        if animation is None:
+            return self.get_obstacle_asset(obstacle_type, height)
+        return animation.frame_at(t)
+
+    def get_powerup_frame(self, powerup_type: str, t: float) -> Optional[pygame.Surface]:
+        """The frame of the power-up animation at simulation time `t`."""
+        animation = self.animations.get(f'powerup_{powerup_type}:default')
+        if animation is None:
+            return self.get_powerup_asset(powerup_type)
+        return animation.frame_at(t)
 
     def get_powerup_asset(self, powerup_type: str) -> Optional[pygame.Surface]:
         return self.get_asset(f'powerup_{powerup_type}')
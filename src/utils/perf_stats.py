@@ -0,0 +1,46 @@
+import time
+
+
+class StageTimer:
+    """Accumulates wall-clock time spent in named pipeline stages."""
+
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+        self.start_time = time.perf_counter()
+
+    def add(self, stage, elapsed):
+        """Record one run of `stage` that took `elapsed` seconds."""
+        self.totals[stage] = self.totals.get(stage, 0.0) + elapsed
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    def reset(self):
+        self.totals.clear()
+        self.counts.clear()
+        self.start_time = time.perf_counter()
+
+    def get_stats(self):
+        """Return {stage: {'calls', 'total_ms', 'mean_ms', 'per_second'}} in insertion order."""
+        stats = {}
+        for stage, total in self.totals.items():
+            calls = self.counts[stage]
+            stats[stage] = {
+                'calls': calls,
+                'total_ms': total * 1000,
+                'mean_ms': total * 1000 / calls if calls else 0.0,
+                'per_second': calls / total if total > 0 else float('inf')
+            }
+        return stats
+
+    def report(self, frames=None):
+        """Return a printable per-stage throughput table."""
+        wall_time = time.perf_counter() - self.start_time
+        lines = [f"{'Stage':<12}{'Calls':>8}{'Total ms':>12}{'Mean ms':>10}{'Stage/s':>10}"]
+        for stage, values in self.get_stats().items():
+            lines.append(
+                f"{stage:<12}{values['calls']:>8}{values['total_ms']:>12.1f}"
+                f"{values['mean_ms']:>10.2f}{values['per_second']:>10.1f}"
+            )
+        if frames:
+            lines.append(f"{frames} frames in {wall_time:.2f}s -> {frames / wall_time:.1f} FPS end to end")
+        return "\n".join(lines)
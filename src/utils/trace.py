@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+TRACE_FORMAT_VERSION = 2  # 2 added final_state; version 1 traces still load
+
+
+class Trace(NamedTuple):
+    """One recorded game: the engine seed plus the input of every tick."""
+    seed: int
+    dts: np.ndarray     # float64 (N,) dt passed to GameEngine.update
+    noses: np.ndarray   # float64 (N, 2) normalized nose points, NaN where there was none
+    final_score: Optional[int] = None
+    final_state: Optional[str] = None  # GameEngine.state_digest() after the last tick
+
+    def __len__(self):
+        return len(self.dts)
+
+    def ticks(self):
+        """Yield (dt, nose_point) in the form GameEngine.update expects."""
+        for dt, (x, y) in zip(self.dts.tolist(), self.noses.tolist()):
+            yield dt, (None if x != x else (x, y))  # NaN marks a missing nose point
+
+
+class TraceRecorder:
+    """Collects the per-tick (dt, nose_point) stream of a game for later replay."""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self._dts = []
+        self._noses = []
+
+    def __len__(self):
+        return len(self._dts)
+
+    def record(self, dt, nose_point):
+        self._dts.append(dt)
+        self._noses.append(nose_point if nose_point is not None else (float('nan'), float('nan')))
+
+    def to_trace(self, final_score=None, final_state=None):
+        noses = np.array(self._noses, dtype=np.float64).reshape(-1, 2)
+        return Trace(self.seed, np.array(self._dts, dtype=np.float64), noses, final_score, final_state)
+
+    def save(self, path, final_score=None, final_state=None):
+        """Write the trace as a compressed .npz file."""
+        save_trace(path, self.to_trace(final_score, final_state))
+
+
+def save_trace(path, trace):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        version=TRACE_FORMAT_VERSION,
+        seed=np.uint64(trace.seed),
+        dts=trace.dts,
+        noses=trace.noses,
+        final_score=-1 if trace.final_score is None else trace.final_score,
+        final_state=trace.final_state or ''
+    )
+
+
+def load_trace(path) -> Trace:
+    with np.load(path) as data:
+        version = int(data['version'])
+        if not 1 <= version <= TRACE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported trace version {version} in {path}")
+        final_score = int(data['final_score'])
+        final_state = str(data['final_state']) if 'final_state' in data.files else ''
+        return Trace(
+            int(data['seed']),
+            data['dts'].astype(np.float64),
+            data['noses'].astype(np.float64).reshape(-1, 2),
+            None if final_score < 0 else final_score,
+            final_state or None
+        )
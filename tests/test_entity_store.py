@@ -0,0 +1,131 @@
+import random
+
+import pygame
+import pytest
+
+from src.entities.entity_store import EntityStore
+
+
+def _colliderect_hits(store, rect, skip_flags=0):
+    """Reference answer: one pygame.Rect per row, the way the legacy collision path did it."""
+    return [i for i in range(len(store))
+            if not store.flags[i] & skip_flags
+            and rect.colliderect(pygame.Rect(store.x[i], store.y[i], store.width[i], store.height[i]))]
+
+
+def _random_store(rng, rows):
+    store = EntityStore(['low', 'high'])
+    for _ in range(rows):
+        store.add(rng.choice(['low', 'high']),
+                  rng.uniform(-80, 300), rng.uniform(-20, 200),
+                  rng.choice([0, 0.5, 20, 40.7, 60]), rng.choice([0, 10, 35.2, 80]),
+                  1.0, rng.choice([0, EntityStore.FLAG_AIR]))
+    return store
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_overlapping_matches_colliderect(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        store = _random_store(rng, rng.randint(0, 12))  # Random spawn x, so rows are usually unsorted
+        if rng.random() < 0.5:
+            store.move(rng.uniform(0, 50), 1.0)
+            store.cull()
+        rect = pygame.Rect(rng.randint(-20, 250), rng.randint(-20, 180), rng.choice([0, 50]), 50)
+        skip_flags = rng.choice([0, EntityStore.FLAG_AIR])
+
+        assert store.overlapping(rect, skip_flags).tolist() == _colliderect_hits(store, rect, skip_flags)
+
+
+def test_overlapping_unsorted_rows_in_spawn_order():
+    store = EntityStore(['low'])
+    for x in (120, 10, 60, 30):
+        store.add('low', x, 0, 40, 40, 1.0)
+    rect = pygame.Rect(40, 0, 50, 50)
+
+    assert store.overlapping(rect).tolist() == _colliderect_hits(store, rect) == [1, 2, 3]
+
+
+def test_overlapping_negative_x_truncates_like_rect():
+    store = EntityStore(['low'])
+    store.add('low', -10.7, 0, 10.5, 40, 1.0)  # Rect(-10, 0, 10, 40): right edge at 0
+    store.add('low', -10.2, 0, 11.9, 40, 1.0)  # Rect(-10, 0, 11, 40): right edge at 1
+    rect = pygame.Rect(0, 0, 50, 50)
+
+    assert store.overlapping(rect).tolist() == _colliderect_hits(store, rect) == [1]
+
+
+def test_overlapping_ignores_zero_size_rows():
+    store = EntityStore(['low'])
+    store.add('low', 10, 10, 0, 40, 1.0)
+    store.add('low', 10, 10, 40, 0, 1.0)
+    store.add('low', 10, 10, 0.9, 40, 1.0)  # Truncates to zero width
+    store.add('low', 10, 10, 40, 40, 1.0)
+    rect = pygame.Rect(0, 0, 50, 50)
+
+    assert store.overlapping(rect).tolist() == _colliderect_hits(store, rect) == [3]
+    assert store.overlapping(pygame.Rect(0, 0, 0, 50)).tolist() == []
+
+
+def test_overlapping_skip_flags():
+    store = EntityStore(['low', 'high'])
+    store.add('low', 10, 10, 40, 40, 1.0)
+    store.add('high', 20, 10, 40, 40, 1.0, EntityStore.FLAG_AIR)
+    rect = pygame.Rect(0, 0, 50, 50)
+
+    assert store.overlapping(rect).tolist() == [0, 1]
+    assert store.overlapping(rect, EntityStore.FLAG_AIR).tolist() == _colliderect_hits(store, rect, EntityStore.FLAG_AIR) == [0]
+
+
+def test_swept_catches_obstacle_passing_within_one_tick():
+    store = EntityStore(['low'])
+    store.add('low', 300, 100, 40, 50, 1.0)
+    store.move(400, 1.0)  # From x=300 to x=-100, straight through the player
+    rect = pygame.Rect(100, 100, 50, 50)
+
+    assert store.overlapping(rect).tolist() == []
+    assert store.swept_overlapping(rect, prev_top=100).tolist() == [0]
+
+
+def test_swept_catches_overlap_at_start_of_tick():
+    store = EntityStore(['low'])
+    store.add('low', 110, 100, 40, 50, 1.0)
+    store.move(200, 1.0)  # Overlapping at the start, clear of the player a quarter into the tick
+    rect = pygame.Rect(100, 100, 50, 50)
+
+    assert store.overlapping(rect).tolist() == []
+    assert store.swept_overlapping(rect, prev_top=100).tolist() == [0]
+
+
+def test_swept_misses_when_overlaps_on_each_axis_do_not_coincide():
+    store = EntityStore(['low'])
+    store.add('low', 160, 100, 40, 50, 1.0)
+    store.move(400, 1.0)  # Overlaps the player's columns only early in the tick...
+    rect = pygame.Rect(100, 100, 50, 50)
+
+    # ...while the player drops onto the obstacle's rows only in the second half
+    assert store.swept_overlapping(rect, prev_top=0).tolist() == []
+
+
+def test_swept_stationary_overlap():
+    store = EntityStore(['low'])
+    store.add('low', 110, 100, 40, 50, 1.0)
+    store.add('low', 200, 100, 40, 50, 1.0)
+    store.move(0, 1.0)
+    rect = pygame.Rect(100, 100, 50, 50)
+
+    assert store.swept_overlapping(rect, prev_top=100).tolist() == store.overlapping(rect).tolist() == [0]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_swept_contains_discrete_at_end_of_tick(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        store = _random_store(rng, rng.randint(0, 12))
+        store.move(rng.uniform(0, 120), 1.0)
+        rect = pygame.Rect(rng.randint(-20, 250), rng.randint(-20, 180), rng.choice([0, 50]), 50)
+        prev_top = rng.randint(-20, 180)
+        skip_flags = rng.choice([0, EntityStore.FLAG_AIR])
+
+        swept = set(store.swept_overlapping(rect, prev_top, skip_flags).tolist())
+        assert set(store.overlapping(rect, skip_flags).tolist()) <= swept
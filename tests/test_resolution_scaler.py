@@ -0,0 +1,37 @@
+from src.core.resolution_scaler import ResolutionScaler
+
+
+def test_ineffective_drop_floor_is_lifted_again():
+    scaler = ResolutionScaler(target_fps=60, cooldown_frames=30, floor_periods=10)
+    scales = []
+    for _ in range(1000):
+        scaler.record_frame_time(0.030)  # Over budget whatever the scale: dropping never helps
+        scales.append(scaler.scale)
+
+    assert scaler.scale_changes >= 4  # Undone drops keep being retried instead of locking at 1.0
+    assert max(scales) == 1.0
+    assert min(scales) == 1.0 - scaler.step  # Never more than one step below what was already tried
+
+
+def test_floor_set_during_spike_lifts_when_load_changes():
+    scaler = ResolutionScaler(target_fps=60, cooldown_frames=30)
+    for i in range(2000):
+        elapsed = 0.012 + 0.012 * scaler.scale ** 2  # Render-bound: a lower scale is cheaper
+        if 30 <= i < 80:
+            elapsed += 0.02  # Inference spike right after the first drop hides its gain
+        scaler.record_frame_time(elapsed)
+
+    assert scaler.scale < 1.0
+    assert scaler.avg_frame_time <= scaler.frame_budget
+
+
+def test_reset_clears_floor():
+    scaler = ResolutionScaler(target_fps=60, cooldown_frames=1)
+    for _ in range(10):
+        scaler.record_frame_time(0.030)
+    scaler.floor = 1.0
+
+    scaler.reset()
+
+    assert scaler.scale == 1.0
+    assert scaler.floor == scaler.min_scale
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from src.core.engine import GameEngine
+from src.core.timestep import FixedTimestep
+from src.processors.nose_predictor import NosePredictor
+from src.processors.tick_input import TickInputQueue
+from src.utils.config_manager import ConfigManager
+from src.utils.game_utils import GameState
+
+CONFIG_PATH = Path(__file__).resolve().parents[1] / 'config.json'
+CAMERA_FPS = 30
+CAMERA_PHASE = 0.004  # Keeps capture times off the tick boundaries
+
+
+def _nose_y(t):
+    """A player nodding for 0.2s every 1.3s, otherwise still; nods are just above the jump threshold."""
+    return 0.36 if t % 1.3 > 1.1 else 0.5
+
+
+def _play(render_fps, total_ticks=1100, predictor=True):
+    """Run the game loop the way VideoProcessor does, with frames drawn at render_fps.
+
+    Returns the engine's state digest after `total_ticks` ticks and how many jumps started.
+    """
+    config = ConfigManager(str(CONFIG_PATH)).config
+    # No obstacles, so the game lasts and the outcome is down to the jumps alone
+    config['game']['min_spawn_interval'] = config['game']['max_spawn_interval'] = 10 ** 9
+    engine = GameEngine(config, seed=7, verbose=False)
+    engine.game_state = GameState.PLAYING
+    timestep = FixedTimestep(60, max_ticks=5)
+    tick_input = TickInputQueue(NosePredictor() if predictor else None)
+
+    sample = 0
+    jumps = 0
+    frame_dt = 1.0 / render_fps
+    frame = 0
+    while engine.tick_count < total_ticks:
+        frame += 1
+        frame_start = frame * frame_dt
+        # Camera samples captured by now have arrived (no inference latency here)
+        while sample / CAMERA_FPS + CAMERA_PHASE <= frame_start:
+            t = sample / CAMERA_FPS + CAMERA_PHASE
+            tick_input.push((0.5, _nose_y(t)), t)
+            sample += 1
+
+        ticks, dt = timestep.advance(frame_dt), timestep.dt
+        for i in range(ticks):
+            tick_time = frame_start - (ticks - 1 - i + timestep.alpha) * dt
+            was_jumping = engine.player.is_jumping
+            engine.update(dt, tick_input.next_input(tick_time))
+            jumps += engine.player.is_jumping and not was_jumping
+            if engine.tick_count == total_ticks:
+                break
+    return engine.state_digest(), jumps
+
+
+@pytest.mark.parametrize('predictor', [True, False])
+@pytest.mark.parametrize('render_fps', [24, 30, 144])
+def test_render_rate_does_not_change_the_game(render_fps, predictor):
+    reference, jumps = _play(60, predictor=predictor)
+    assert jumps > 0  # The trace must actually exercise the jump detection
+
+    assert _play(render_fps, predictor=predictor) == (reference, jumps)
+
+
+def test_each_sample_reaches_one_tick():
+    tick_input = TickInputQueue()
+    tick_input.push((0.5, 0.4), 0.010)
+    tick_input.push((0.5, 0.3), 0.020)
+
+    assert tick_input.next_input(0.005) is None       # Nothing captured yet
+    assert tick_input.next_input(0.025) == (0.5, 0.4)  # Backlog: one sample per tick
+    assert tick_input.next_input(0.030) == (0.5, 0.3)
+    assert tick_input.next_input(0.035) == (0.5, 0.3)  # No new sample: hold
+
+
+def test_reset_forgets_samples():
+    tick_input = TickInputQueue(NosePredictor())
+    tick_input.push((0.5, 0.4), 0.010)
+    tick_input.next_input(0.020)
+
+    tick_input.reset()
+
+    assert tick_input.next_input(0.030) is None